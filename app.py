@@ -14,7 +14,7 @@ from huggingface_hub import InferenceClient
 
 from ingestion import retrieve_relevant_chunks, get_chroma_collection, CHROMA_DIR
 from crawler import get_download_stats, DB_PATH, init_db, PDF_DIR, EXCEL_DIR, WORD_DIR
-from scheduler import start_scheduler, get_last_update, trigger_manual_update
+from scheduler import start_scheduler, get_last_update, trigger_manual_update, run_manual_crawl
 
 # ─── Logging ───────────────────────────────────────────────────────────────────
 logging.basicConfig(level=logging.INFO)
@@ -411,11 +411,13 @@ with st.sidebar:
         else:
             st.warning("An update is already running.")
 
-    if st.button("🕷️ Run Crawler"):
-        from crawler import run_crawl
+    if st.button("🕷️ Run Crawler", disabled=is_running):
         with st.spinner("Crawling IRDAI website…"):
-            summary = run_crawl()
-        st.success(f"Crawl done — PDFs: {summary.get('pdf',0)}, Excel: {summary.get('excel',0)}, Word: {summary.get('word',0)}")
+            summary = run_manual_crawl()
+        if summary is None:
+            st.warning("An update is already running.")
+        else:
+            st.success(f"Crawl done — PDFs: {summary.get('pdf',0)}, Excel: {summary.get('excel',0)}, Word: {summary.get('word',0)}")
 
     if st.button("📥 Run Ingestion"):
         from ingestion import run_ingestion
@@ -0,0 +1,316 @@
+"""
+IRDAI Compliance GPT - Benchmarks
+Micro-benchmarks for crawler hot paths, run against saved IRDAI pages.
+
+    python benchmark.py save-pages --limit 40   # snapshot pages into data/bench_pages
+    python benchmark.py parse --repeat 5        # legacy 4× BeautifulSoup vs single-pass lxml
+    python benchmark.py record                  # live crawl recorded into data/replay/irdai.warc
+    python benchmark.py crawl --latency-ms 80   # run_crawl against the recording
+    python benchmark.py embed --docs 400        # per-document vs cross-document encode batches
+"""
+
+import os
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from contextlib import contextmanager
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+import crawler
+
+BENCH_PAGES_DIR = crawler._DATA_ROOT / "bench_pages"
+REPLAY_ARCHIVE  = crawler._DATA_ROOT / "replay" / "irdai.warc"
+
+
+# ─── Page Snapshots ────────────────────────────────────────────────────────────
+def save_sample_pages(dest: Path = BENCH_PAGES_DIR, limit: int = 40) -> int:
+    """Download listing/section pages from the live site for offline benchmarking.
+    Each file stores the page URL on its first line, followed by the HTML."""
+    dest.mkdir(parents=True, exist_ok=True)
+    paths = list(crawler.DOCUMENT_CATEGORIES.values()) + crawler.EXTRA_PAGES
+    saved = 0
+    for path in paths[:limit]:
+        url = crawler.BASE_URL + path
+        resp = crawler.fetch_with_retry(url)
+        if not resp:
+            continue
+        name = path.strip("/").replace("/", "_") or "root"
+        (dest / f"{name}.html").write_text(url + "\n" + resp.text, encoding="utf-8")
+        saved += 1
+    return saved
+
+
+def load_pages(src: Path = BENCH_PAGES_DIR) -> list[tuple[str, str]]:
+    """Return (url, html) pairs saved by save_sample_pages."""
+    pages = []
+    for f in sorted(src.glob("*.html")):
+        url, _, html = f.read_text(encoding="utf-8").partition("\n")
+        pages.append((url, html))
+    return pages
+
+
+# ─── Link Extraction ───────────────────────────────────────────────────────────
+def legacy_extract(html: str, base_url: str) -> crawler.PageLinks:
+    """The pre-lxml extractors: one html.parser BeautifulSoup parse per question."""
+    soup = BeautifulSoup(html, "html.parser")
+    docs = set()
+    for tag in soup.find_all("a", href=True):
+        href = tag["href"].strip()
+        if href.startswith("javascript"):
+            continue
+        for ext in crawler.DOC_TYPES:
+            if ext in href.lower():
+                docs.add((urljoin(base_url, href), ext))
+                break
+
+    soup = BeautifulSoup(html, "html.parser")
+    details = set()
+    for tag in soup.find_all("a", href=True):
+        href = tag["href"].strip()
+        if "document-detail" in href and "documentId" in href:
+            details.add(urljoin(base_url, href))
+
+    soup = BeautifulSoup(html, "html.parser")
+    next_url = None
+    for tag in soup.find_all("a", href=True):
+        href = tag["href"].strip()
+        if href.startswith("javascript"):
+            continue
+        if tag.get_text(strip=True).lower() in ("next", "next page", "›", "»"):
+            next_url = urljoin(base_url, href)
+            break
+
+    soup = BeautifulSoup(html, "html.parser")
+    internal = set()
+    for a in soup.find_all("a", href=True):
+        href = a["href"].strip()
+        if href.startswith("javascript") or href.startswith("#") or href.startswith("mailto"):
+            continue
+        if href.startswith("/") or "irdai.gov.in" in href:
+            internal.add(urljoin(base_url, href))
+
+    return crawler.PageLinks(list(docs), list(details), next_url, list(internal))
+
+
+def _time_per_page(func, pages: list[tuple[str, str]], repeat: int) -> float:
+    """Median seconds to run `func` over every page once."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for url, html in pages:
+            func(html, url)
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+
+def bench_parse(pages: list[tuple[str, str]], repeat: int = 5) -> dict:
+    """Compare legacy vs single-pass extraction; also checks both find the same links."""
+    for url, html in pages:
+        old, new = legacy_extract(html, url), crawler.extract_page_links(html, url)
+        for field in ("doc_links", "detail_links", "internal_links"):
+            if set(getattr(old, field)) != set(getattr(new, field)):
+                raise AssertionError(f"{field} differ on {url}")
+        if old.next_url != new.next_url:
+            raise AssertionError(f"next_url differs on {url}")
+
+    legacy = _time_per_page(legacy_extract, pages, repeat)
+    single = _time_per_page(crawler.extract_page_links, pages, repeat)
+    return {
+        "pages":           len(pages),
+        "bytes":           sum(len(html) for _, html in pages),
+        "legacy_ms_page":  round(legacy / len(pages) * 1000, 3),
+        "lxml_ms_page":    round(single / len(pages) * 1000, 3),
+        "speedup":         round(legacy / single, 1),
+    }
+
+
+# ─── Crawl Replay ──────────────────────────────────────────────────────────────
+@contextmanager
+def _scratch_data_root(**env: str):
+    """Run a crawl from an empty temp directory (crawler data paths are
+    relative), with crawler settings applied both here and, through the
+    environment, in sharded worker processes."""
+    cwd, saved = Path.cwd(), {k: os.environ.get(k) for k in env}
+    scratch = Path(tempfile.mkdtemp(prefix="irdai-bench-"))
+    os.environ.update(env)
+    crawler.RECORD_ARCHIVE = env.get("IRDAI_RECORD_ARCHIVE", "")
+    crawler.REPLAY_ARCHIVE = env.get("IRDAI_REPLAY_ARCHIVE", "")
+    crawler.REPLAY_LATENCY_MS = env.get("IRDAI_REPLAY_LATENCY_MS", "0")
+    crawler.CRAWL_RATE_PER_HOST = float(env.get("IRDAI_CRAWL_RPS", crawler.CRAWL_RATE_PER_HOST))
+    crawler.reset_http_transport()
+    crawler.close_tracker()
+    os.chdir(scratch)
+    try:
+        yield scratch
+    finally:
+        crawler.flush_downloads()
+        crawler.close_tracker()
+        crawler.reset_http_transport()
+        os.chdir(cwd)
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def record_crawl(archive: Path = REPLAY_ARCHIVE) -> dict:
+    """Full live crawl from an empty data root, every exchange archived."""
+    archive = archive.resolve()
+    archive.unlink(missing_ok=True)
+    with _scratch_data_root(IRDAI_RECORD_ARCHIVE=str(archive)):
+        # One process, so a single writer appends to the archive
+        summary = crawler.run_crawl(revalidate=False, workers=1)
+    return {"archive": str(archive), "requests": summary["http"]["requests"]}
+
+
+def bench_crawl(archive: Path = REPLAY_ARCHIVE, latency_ms: str = "0", engine: str = "sequential",
+                workers: int = 1, rps: float = 0, repeat: int = 3) -> dict:
+    """Cold run_crawl / run_crawl_async against the replayed archive; median of `repeat` runs."""
+    runs = []
+    for _ in range(repeat):
+        with _scratch_data_root(IRDAI_REPLAY_ARCHIVE=str(archive.resolve()),
+                                IRDAI_REPLAY_LATENCY_MS=latency_ms, IRDAI_CRAWL_RPS=str(rps)):
+            start = time.perf_counter()
+            if engine == "async":
+                summary = crawler.run_crawl_async(revalidate=False)
+            else:
+                summary = crawler.run_crawl(revalidate=False, workers=workers)
+            wall = time.perf_counter() - start
+        docs = summary["pdf"] + summary["excel"] + summary["word"]
+        runs.append((wall, summary["stats"].get("pages_fetched", 0), docs, summary["http"]["requests"]))
+
+    wall, pages, docs, requests_made = sorted(runs)[len(runs) // 2]
+    return {
+        "engine":       engine if workers == 1 else f"{engine} ×{workers}",
+        "latency_ms":   latency_ms,
+        "wall_s":       round(wall, 2),
+        "pages":        pages,
+        "documents":    docs,
+        "requests":     requests_made,
+        "pages_per_s":  round(pages / wall, 1),
+        "docs_per_s":   round(docs / wall, 1),
+    }
+
+
+# ─── Embedding Batches ─────────────────────────────────────────────────────────
+_WORDS = ("insurer", "policyholder", "premium", "solvency", "circular", "authority", "claim",
+          "reinsurance", "intermediary", "compliance", "regulation", "disclosure", "grievance")
+
+
+def synthetic_corpus(docs: int = 400, seed: int = 7) -> list[tuple[Path, list[dict]]]:
+    """(path, pages) for a corpus of mostly small documents: ~80% are
+    one-page circulars of a few chunks, the rest run to several pages."""
+    rng = random.Random(seed)
+    corpus = []
+    for n in range(docs):
+        page_count = 1 if rng.random() < 0.8 else rng.randint(3, 12)
+        name = f"bench_{n:04d}.pdf"
+        pages = [
+            {"page": p, "source": name,
+             "text": " ".join(rng.choice(_WORDS) for _ in range(rng.randint(200, 600)))}
+            for p in range(1, page_count + 1)
+        ]
+        corpus.append((Path(name), pages))
+    return corpus
+
+
+def load_corpus(src: Path) -> list[tuple[Path, list[dict]]]:
+    """(path, pages) of the documents under a directory (PDF/Excel/Word)."""
+    import ingestion
+    files = [f for f in sorted(src.rglob("*")) if f.suffix.lower() in (".pdf", ".xlsx", ".docx")]
+    return [(f, pages) for f, pages in ((f, ingestion.extract_document_text(f)) for f in files) if pages]
+
+
+def bench_embed(corpus: list[tuple[Path, list[dict]]], batch_size: int = 256, repeat: int = 3) -> dict:
+    """Chunks/s of embed + upsert with one encode call per document (the old
+    ingest path) vs ChunkAccumulator's cross-document batches, each run into
+    a fresh in-memory Chroma collection. Extraction is not timed."""
+    import chromadb
+    import ingestion
+
+    model = ingestion.get_embed_model()
+    client = chromadb.EphemeralClient()
+    chunks = sum(len(ingestion.chunk_pages(pages)) for _, pages in corpus)
+
+    def per_document(collection):
+        for path, pages in corpus:
+            prepared = ingestion.prepare_chunks(path, pages)
+            if prepared:
+                ids, texts, metadatas = prepared
+                embeddings = model.encode(texts, batch_size=32, show_progress_bar=False).tolist()
+                ingestion.upsert_chunks(path, collection, ids, texts, metadatas, embeddings)
+
+    def accumulated(collection):
+        accumulator = ingestion.ChunkAccumulator(collection, model, batch_size)
+        for path, pages in corpus:
+            accumulator.add(path, pages)
+        accumulator.flush()
+
+    model.encode(["warm-up"], show_progress_bar=False)
+    result = {"documents": len(corpus), "chunks": chunks, "batch_size": batch_size}
+    for label, func in (("per_document", per_document), ("accumulated", accumulated)):
+        runs = []
+        for i in range(repeat):
+            collection = client.create_collection(f"bench_{label}_{i}_{time.time_ns()}")
+            start = time.perf_counter()
+            func(collection)
+            runs.append(time.perf_counter() - start)
+            client.delete_collection(collection.name)
+        result[f"{label}_chunks_per_s"] = round(chunks / statistics.median(runs), 1)
+    result["speedup"] = round(result["accumulated_chunks_per_s"] / result["per_document_chunks_per_s"], 2)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IRDAI crawler benchmarks")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_save = sub.add_parser("save-pages", help="snapshot live pages for offline runs")
+    p_save.add_argument("--limit", type=int, default=40)
+    p_parse = sub.add_parser("parse", help="link extraction micro-benchmark")
+    p_parse.add_argument("--pages", type=Path, default=BENCH_PAGES_DIR)
+    p_parse.add_argument("--repeat", type=int, default=5)
+    p_record = sub.add_parser("record", help="live crawl into a WARC archive for replay")
+    p_record.add_argument("--archive", type=Path, default=REPLAY_ARCHIVE)
+    p_crawl = sub.add_parser("crawl", help="run_crawl against a recorded archive")
+    p_crawl.add_argument("--archive", type=Path, default=REPLAY_ARCHIVE)
+    p_crawl.add_argument("--latency-ms", default="0",
+                         help='simulated per-request latency, or "recorded"')
+    p_crawl.add_argument("--engine", choices=("sequential", "async"), default="sequential")
+    p_crawl.add_argument("--workers", type=int, default=1)
+    p_crawl.add_argument("--rps", type=float, default=0, help="per-host rate limit (0 = off)")
+    p_crawl.add_argument("--repeat", type=int, default=3)
+    p_embed = sub.add_parser("embed", help="embedding throughput, per-document vs accumulated batches")
+    p_embed.add_argument("--docs", type=int, default=400, help="synthetic corpus size")
+    p_embed.add_argument("--corpus", type=Path, help="directory of real documents instead")
+    p_embed.add_argument("--batch-size", type=int, default=256)
+    p_embed.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.cmd == "save-pages":
+        print("Saved pages:", save_sample_pages(limit=args.limit))
+    elif args.cmd == "parse":
+        sample = load_pages(args.pages)
+        if not sample:
+            raise SystemExit(f"No saved pages in {args.pages} – run `save-pages` first")
+        print("Parse benchmark:", bench_parse(sample, args.repeat))
+    elif args.cmd == "record":
+        print("Recorded:", record_crawl(args.archive))
+    elif args.cmd == "crawl":
+        if not args.archive.exists():
+            raise SystemExit(f"No archive at {args.archive} – run `record` first")
+        print("Crawl benchmark:", bench_crawl(
+            args.archive, args.latency_ms, args.engine, args.workers, args.rps, args.repeat
+        ))
+    elif args.cmd == "embed":
+        docs = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.docs)
+        if not docs:
+            raise SystemExit(f"No extractable documents under {args.corpus}")
+        print("Embedding benchmark:", bench_embed(docs, args.batch_size, args.repeat))
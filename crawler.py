@@ -4,14 +4,39 @@ Crawls IRDAI website, downloads PDFs, Excel and Word docs with deduplication via
 """
 
 import os
+import re
+import math
+import random
+import json
 import time
+import queue
+import shutil
+import atexit
+import asyncio
 import sqlite3
 import hashlib
+import socket
 import logging
+import threading
 import requests
+import multiprocessing
+from uuid import uuid4
+from email.utils import parsedate_to_datetime
+from collections import Counter
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qs, parse_qsl, urlencode
+from typing import NamedTuple
+import lxml.html
+import lxml.etree
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+from webarchive import WarcWriter, RecordingAdapter, ReplayAdapter
 
 # ─── Logging ───────────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -29,9 +54,11 @@ PDF_DIR   = _DATA_ROOT / "pdfs"
 EXCEL_DIR = _DATA_ROOT / "excel"
 WORD_DIR  = _DATA_ROOT / "word"
 DB_PATH   = _DATA_ROOT / "irdai_tracker.db"
+# Content-addressed store: one file per SHA-256, category paths hardlink to it
+BLOB_DIR  = _DATA_ROOT / "blobs"
 
 # Ensure writable dirs exist at import time
-for _d in [_DATA_ROOT, PDF_DIR, EXCEL_DIR, WORD_DIR]:
+for _d in [_DATA_ROOT, PDF_DIR, EXCEL_DIR, WORD_DIR, BLOB_DIR]:
     _d.mkdir(parents=True, exist_ok=True)
 
 # Supported file extensions mapped to their target directory
@@ -236,49 +263,982 @@ HEADERS = {
 
 MAX_RETRIES = 3
 BACKOFF_BASE = 2  # seconds
+BACKOFF_MAX  = 60
+# Honour a server's Retry-After on 429/503, up to this many seconds
+RETRY_AFTER_MAX = float(os.getenv("IRDAI_RETRY_AFTER_MAX", "120"))
+
+# Statuses that mean the URL is gone: never retried, and remembered so later
+# runs skip it until it is DEAD_URL_RECHECK_DAYS old. Other 4xx are not retried.
+DEAD_STATUSES = {404, 410}
+RETRY_STATUSES = {408, 425, 429}    # plus every 5xx
+DEAD_URL_RECHECK_DAYS = float(os.getenv("IRDAI_DEAD_URL_RECHECK_DAYS", "30"))
+
+# Circuit breaker: this many consecutive transient failures on a host pause
+# it for CIRCUIT_COOLDOWN seconds (requests wait), then one trial request goes
+# out. If that fails too the host is down: the rest of the run is deferred to
+# the next one, as when the crawl budget is spent
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("IRDAI_CIRCUIT_FAILURES", "5"))
+CIRCUIT_COOLDOWN          = float(os.getenv("IRDAI_CIRCUIT_COOLDOWN", "60"))
+
+# Async engine: total requests in flight and the cap for any single host
+CRAWL_CONCURRENCY    = int(os.getenv("IRDAI_CRAWL_CONCURRENCY", "8"))
+PER_HOST_CONCURRENCY = int(os.getenv("IRDAI_PER_HOST_CONCURRENCY", "4"))
+
+# Sequential crawl: download workers fed by the page parsers, and queue bound
+DOWNLOAD_WORKERS    = int(os.getenv("IRDAI_DOWNLOAD_WORKERS", "4"))
+DOWNLOAD_QUEUE_SIZE = int(os.getenv("IRDAI_DOWNLOAD_QUEUE_SIZE", "64"))
+
+# Keep-alive connections kept open per host by the shared HTTP pool
+HTTP_POOL_SIZE = int(os.getenv("IRDAI_HTTP_POOL_SIZE", "16"))
+
+# Record every HTTP exchange into a WARC file, or serve one instead of the
+# network (offline benchmarks); replay latency in ms, "recorded" to reuse
+# the recorded timings
+RECORD_ARCHIVE = os.getenv("IRDAI_RECORD_ARCHIVE", "")
+REPLAY_ARCHIVE = os.getenv("IRDAI_REPLAY_ARCHIVE", "")
+REPLAY_LATENCY_MS = os.getenv("IRDAI_REPLAY_LATENCY_MS", "0")
+
+# Politeness: token bucket per host (sustained requests/sec and burst size).
+# A rate of 0 disables throttling.
+CRAWL_RATE_PER_HOST = float(os.getenv("IRDAI_CRAWL_RPS", "3"))
+CRAWL_BURST         = int(os.getenv("IRDAI_CRAWL_BURST", "5"))
+
+# Unchanged pages are re-processed anyway once their cache entry is this old
+PAGE_CACHE_MAX_AGE_HOURS = float(os.getenv("IRDAI_PAGE_CACHE_MAX_AGE_HOURS", str(7 * 24)))
+
+# A frontier page that failed this many times is not retried on resume
+FRONTIER_MAX_ATTEMPTS = 3
+
+# Deep crawl (breadth-first from /home): link depth, page and wall-clock budgets
+DEEP_MAX_DEPTH   = int(os.getenv("IRDAI_DEEP_MAX_DEPTH", "3"))
+DEEP_MAX_PAGES   = int(os.getenv("IRDAI_DEEP_MAX_PAGES", "1500"))
+DEEP_MAX_SECONDS = float(os.getenv("IRDAI_DEEP_MAX_SECONDS", str(30 * 60)))
+
+# Frontier priority: path words that mark regulatory sections, and the
+# penalty per link level (so a regulatory page two levels down still beats
+# a generic page one level down)
+PRIORITY_KEYWORDS = {
+    "regulation": 6, "circular": 6, "notification": 5, "guideline": 5,
+    "gazette": 4, "master": 4, "act": 3, "rule": 3, "order": 3,
+    "exposure": 3, "notice": 3, "release": 2, "report": 1,
+}
+DEPTH_PENALTY = 2.0
+# Pages that changed on most past visits get up to this much extra priority
+CHANGE_PRIORITY_WEIGHT = 4.0
+
+# Per-run budgets for run_crawl (0 = unlimited). When one runs out the crawl
+# stops taking new pages/documents and leaves the rest of the frontier for
+# the next run.
+CRAWL_TIME_BUDGET = float(os.getenv("IRDAI_CRAWL_TIME_BUDGET", "0"))
+CRAWL_BYTE_BUDGET = int(float(os.getenv("IRDAI_CRAWL_BYTE_BUDGET_MB", "0")) * 1024 * 1024)
+
+# Path prefixes that serve the same page as the bare path (Liferay guest site):
+# /web/guest/regulations and /regulations are one page for de-duplication
+SITE_PATH_ALIASES = ("/web/guest",)
+
+# Links never worth queueing as pages
+_SKIP_LINK_MARKERS = ("login", "logout", "p_p_lifecycle=1", "document-detail")
+
+# Seen-URL index: switch from a set to a Bloom filter above this many downloads
+SEEN_INDEX_BLOOM_THRESHOLD = int(os.getenv("IRDAI_SEEN_INDEX_BLOOM_THRESHOLD", "500000"))
+# Download rows buffered before they are written in one transaction
+RECORD_BATCH_SIZE = int(os.getenv("IRDAI_RECORD_BATCH_SIZE", "50"))
+# Chunk read from the socket and write buffer used when streaming documents
+DOWNLOAD_BUFFER_SIZE = int(os.getenv("IRDAI_DOWNLOAD_BUFFER_KB", "64")) * 1024
+
+# Sharded crawl (run_crawl(workers=N)): URLs hash into SHARD_BUCKETS buckets
+# spread over the worker processes; idle workers poll the shared frontier
+# every SHARD_POLL_SECONDS while others may still queue pages for them
+CRAWL_WORKERS       = int(os.getenv("IRDAI_CRAWL_WORKERS", "1"))
+SHARD_BUCKETS       = 4096
+SHARD_POLL_SECONDS  = 0.2
+SHARD_START_METHOD  = os.getenv("IRDAI_SHARD_START_METHOD", "spawn")
+
+# Optional revalidation of downloaded documents: each run sends conditional
+# requests for at most REVALIDATE_PER_RUN documents not checked within
+# REVALIDATE_WINDOW_HOURS (oldest first), so the whole set is covered over
+# the window instead of in one sweep
+REVALIDATE_DOCUMENTS  = os.getenv("IRDAI_REVALIDATE", "0") == "1"
+REVALIDATE_WINDOW_HOURS = float(os.getenv("IRDAI_REVALIDATE_WINDOW_HOURS", str(30 * 24)))
+REVALIDATE_PER_RUN    = int(os.getenv("IRDAI_REVALIDATE_PER_RUN", "200"))
+
+# Sitemaps and RSS/Atom feeds read by run_incremental_crawl (comma-separated
+# paths or URLs); Sitemap: lines of robots.txt are added to these
+FEED_URLS = [u.strip() for u in os.getenv("IRDAI_FEED_URLS", "/sitemap.xml").split(",") if u.strip()]
+
+# Per-request timings (request_metrics table) are kept this many days
+METRICS_RETENTION_DAYS = float(os.getenv("IRDAI_METRICS_RETENTION_DAYS", "30"))
 
 
 # ─── Database Setup ────────────────────────────────────────────────────────────
+_db_conn: sqlite3.Connection | None = None
+_db_lock = threading.RLock()
+
+
+@contextmanager
+def _tracker():
+    """Yield the long-lived WAL-mode tracker connection.
+    One connection is shared by every crawler thread; the lock serializes use."""
+    global _db_conn
+    with _db_lock:
+        if _db_conn is None:
+            DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _db_conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False)
+            _db_conn.execute("PRAGMA journal_mode=WAL")
+            _db_conn.execute("PRAGMA synchronous=NORMAL")
+        yield _db_conn
+
+
+def close_tracker():
+    """Close the tracker connection; the next use reopens DB_PATH."""
+    global _db_conn
+    with _db_lock:
+        if _db_conn is not None:
+            _db_conn.close()
+            _db_conn = None
+
+
+def _ensure_column(conn: sqlite3.Connection, table: str, column: str, decl: str):
+    """Add a column to a table created by an older version of the crawler."""
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
 def init_db():
     """Initialize SQLite database for download tracking."""
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS downloads (
-            id          INTEGER PRIMARY KEY AUTOINCREMENT,
-            url         TEXT UNIQUE NOT NULL,
-            filename    TEXT NOT NULL,
-            category    TEXT,
-            file_hash   TEXT,
-            downloaded_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            status      TEXT DEFAULT 'success'
-        )
-    """)
-    conn.commit()
-    conn.close()
+    with _tracker() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS downloads (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                url         TEXT UNIQUE NOT NULL,
+                filename    TEXT NOT NULL,
+                category    TEXT,
+                file_hash   TEXT,
+                downloaded_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                status      TEXT DEFAULT 'success'
+            )
+        """)
+        for column in ("etag", "last_modified"):
+            _ensure_column(conn, "downloads", column, "TEXT")
+        _ensure_column(conn, "downloads", "content_length", "INTEGER")
+        _ensure_column(conn, "downloads", "validated_at", "DATETIME")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS page_cache (
+                url           TEXT PRIMARY KEY,
+                etag          TEXT,
+                last_modified TEXT,
+                body_hash     TEXT,
+                fetched_at    DATETIME DEFAULT CURRENT_TIMESTAMP,
+                outlinks      TEXT
+            )
+        """)
+        _ensure_column(conn, "page_cache", "outlinks", "TEXT")
+        _ensure_column(conn, "page_cache", "next_url", "TEXT")
+        # How often a page was checked and found changed (frontier priority)
+        _ensure_column(conn, "page_cache", "checks", "INTEGER DEFAULT 0")
+        _ensure_column(conn, "page_cache", "changes", "INTEGER DEFAULT 0")
+        # Listing pages: digest of their document-link set; on a category's
+        # first page also the length of its pagination chain when last walked
+        _ensure_column(conn, "page_cache", "link_digest", "TEXT")
+        _ensure_column(conn, "page_cache", "chain_pages", "INTEGER")
+        _ensure_column(conn, "page_cache", "chain_at", "DATETIME")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                phase       TEXT NOT NULL,
+                url         TEXT NOT NULL,
+                category    TEXT,
+                state       TEXT DEFAULT 'pending',
+                depth       INTEGER DEFAULT 0,
+                priority    REAL DEFAULT 0,
+                attempts    INTEGER DEFAULT 0,
+                last_error  TEXT,
+                updated_at  DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (phase, url)
+            )
+        """)
+        _ensure_column(conn, "frontier", "shard", "INTEGER DEFAULT 0")
+        # Pages and documents taken by one worker of a sharded run
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS run_claims (
+                kind TEXT NOT NULL,
+                key  TEXT NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS document_details (
+                document_id TEXT PRIMARY KEY,
+                detail_url  TEXT NOT NULL,
+                attachments TEXT NOT NULL,
+                resolved_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS dead_urls (
+                url         TEXT PRIMARY KEY,
+                status      INTEGER,
+                first_seen  DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_seen   DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # URLs listed in sitemaps/feeds with the timestamp last seen for them
+        # (is_sitemap: a child sitemap of a sitemap index)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS feed_entries (
+                url         TEXT PRIMARY KEY,
+                feed        TEXT NOT NULL,
+                lastmod     TEXT,
+                is_sitemap  INTEGER DEFAULT 0,
+                first_seen  DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_seen   DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # "Document ready" events: new files for the ingestion worker
+        # (ready → in_progress → done | failed)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_queue (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                path        TEXT NOT NULL,
+                url         TEXT,
+                file_hash   TEXT,
+                state       TEXT DEFAULT 'ready',
+                attempts    INTEGER DEFAULT 0,
+                last_error  TEXT,
+                enqueued_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at  DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_ingest_queue_state ON ingest_queue(state, id)")
+        # One row per fetch_with_retry call; times in milliseconds
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS request_metrics (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id      TEXT NOT NULL,
+                url         TEXT NOT NULL,
+                phase       TEXT,
+                status      INTEGER,
+                bytes       INTEGER DEFAULT 0,
+                dns_ms      REAL DEFAULT 0,
+                connect_ms  REAL DEFAULT 0,
+                ttfb_ms     REAL DEFAULT 0,
+                total_ms    REAL DEFAULT 0,
+                retries     INTEGER DEFAULT 0,
+                sleep_ms    REAL DEFAULT 0,
+                recorded_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_request_metrics_run ON request_metrics(run_id)")
+        conn.commit()
     logger.info("Database initialized at %s", DB_PATH)
 
 
+# (worker index, worker count) of this process; (0, 1) outside a sharded run
+_shard: tuple[int, int] = (0, 1)
+
+
+def _shard_bucket(url: str) -> int:
+    digest = hashlib.blake2b(canonicalize_url(url).encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % SHARD_BUCKETS
+
+
+def _in_shard(url: str) -> bool:
+    """Whether this process owns `url` (always True outside a sharded run)."""
+    index, count = _shard
+    return count == 1 or _shard_bucket(url) % count == index
+
+
+def claim_for_run(kind: str, key: str) -> bool:
+    """Cross-process claim of a page or document for this run. True for the
+    first worker to claim it; always True outside a sharded run."""
+    if _shard[1] == 1:
+        return True
+    with _tracker() as conn:
+        cur = conn.execute("INSERT OR IGNORE INTO run_claims (kind, key) VALUES (?, ?)", (kind, key))
+        conn.commit()
+    return cur.rowcount == 1
+
+
+def clear_run_claims():
+    with _tracker() as conn:
+        conn.execute("DELETE FROM run_claims")
+        conn.commit()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter (double hashing over one blake2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big")
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class SeenUrlIndex:
+    """Downloaded URLs, loaded once per run from the downloads table.
+
+    A plain set for normal histories. Above SEEN_INDEX_BLOOM_THRESHOLD rows it
+    switches to a Bloom filter, and the rare positive is confirmed in SQLite.
+    """
+
+    def __init__(self):
+        self._urls: set[str] = set()
+        self._bloom: BloomFilter | None = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        flush_downloads()
+        with _tracker() as conn:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM downloads WHERE status = 'success'"
+            ).fetchone()[0]
+            rows = conn.execute("SELECT url FROM downloads WHERE status = 'success'")
+            with self._lock:
+                self._urls = set()
+                self._bloom = None
+                if total > SEEN_INDEX_BLOOM_THRESHOLD:
+                    self._bloom = BloomFilter(capacity=total * 2)
+                    for (url,) in rows:
+                        self._bloom.add(url)
+                else:
+                    self._urls.update(url for (url,) in rows)
+                self._loaded = True
+        logger.info(
+            "Seen-URL index loaded: %d downloads (%s)", total, "bloom" if self._bloom else "set"
+        )
+
+    def add(self, url: str):
+        with self._lock:
+            # URLs added this run are kept exactly, even in Bloom mode
+            self._urls.add(url)
+            if self._bloom is not None:
+                self._bloom.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        if not self._loaded:
+            self.load()
+        with self._lock:
+            if url in self._urls:
+                return True
+            if self._bloom is None or url not in self._bloom:
+                return False
+        with _tracker() as conn:
+            return conn.execute(
+                "SELECT 1 FROM downloads WHERE url = ? AND status = 'success'", (url,)
+            ).fetchone() is not None
+
+
+_seen_urls = SeenUrlIndex()
+_pending_downloads: list[tuple] = []
+_pending_lock = threading.Lock()
+
+
+def load_seen_index():
+    """(Re)load the seen-URL index; called at the start of every crawl run."""
+    _seen_urls.load()
+
+
 def is_already_downloaded(url: str) -> bool:
-    """Check if a URL has already been downloaded."""
-    conn = sqlite3.connect(DB_PATH)
-    row = conn.execute(
-        "SELECT id FROM downloads WHERE url = ?", (url,)
-    ).fetchone()
-    conn.close()
-    return row is not None
+    """Check if a URL has already been downloaded (in-memory, no SQLite round trip)."""
+    return url in _seen_urls
+
+
+def record_download(url: str, filename: str, category: str, file_hash: str,
+                    etag: str | None = None, last_modified: str | None = None,
+                    content_length: int | None = None):
+    """Record a successful download and its HTTP validators. Rows are buffered
+    and written in batches of RECORD_BATCH_SIZE; the seen-URL index is
+    updated immediately."""
+    _seen_urls.add(url)
+    with _pending_lock:
+        _pending_downloads.append(
+            (url, filename, category, file_hash, etag, last_modified, content_length)
+        )
+        full = len(_pending_downloads) >= RECORD_BATCH_SIZE
+    if full:
+        flush_downloads()
+
+
+def flush_downloads():
+    """Write buffered download rows in a single transaction."""
+    with _pending_lock:
+        rows = list(_pending_downloads)
+        _pending_downloads.clear()
+    if not rows:
+        return
+    with _tracker() as conn:
+        # Invalid rows become a success once the URL downloads; re-downloads
+        # of a changed document replace the row
+        conn.executemany(
+            """INSERT INTO downloads
+                   (url, filename, category, file_hash, etag, last_modified,
+                    content_length, validated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+               ON CONFLICT(url) DO UPDATE SET
+                   filename = excluded.filename, category = excluded.category,
+                   file_hash = excluded.file_hash, status = 'success',
+                   etag = excluded.etag, last_modified = excluded.last_modified,
+                   content_length = excluded.content_length,
+                   downloaded_at = CURRENT_TIMESTAMP, validated_at = CURRENT_TIMESTAMP""",
+            rows,
+        )
+        conn.commit()
+
+
+def record_invalid_download(url: str, filename: str, category: str, reason: str):
+    """Record a download whose content did not match its type (HTML error or
+    login page instead of the document). It stays out of the seen-URL index,
+    so the next run retries it."""
+    with _tracker() as conn:
+        conn.execute(
+            """INSERT INTO downloads (url, filename, category, status) VALUES (?, ?, ?, ?)
+               ON CONFLICT(url) DO UPDATE SET
+                   status = excluded.status, downloaded_at = CURRENT_TIMESTAMP
+               WHERE downloads.status != 'success'""",
+            (url, filename, category, f"invalid: {reason}"),
+        )
+        conn.commit()
 
 
-def record_download(url: str, filename: str, category: str, file_hash: str):
-    """Record a successful download in SQLite."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute(
-        "INSERT OR IGNORE INTO downloads (url, filename, category, file_hash) "
-        "VALUES (?, ?, ?, ?)",
-        (url, filename, category, file_hash),
-    )
-    conn.commit()
-    conn.close()
+def is_invalid_download(url: str) -> bool:
+    with _tracker() as conn:
+        return conn.execute(
+            "SELECT 1 FROM downloads WHERE url = ? AND status LIKE 'invalid%'", (url,)
+        ).fetchone() is not None
+
+
+def get_invalid_downloads() -> list[tuple[str, str, str]]:
+    """(url, ext, category) of downloads rejected by an earlier run."""
+    with _tracker() as conn:
+        rows = conn.execute(
+            "SELECT url, filename, category FROM downloads WHERE status LIKE 'invalid%'"
+        ).fetchall()
+    return [
+        (url, Path(filename).suffix.lower(), (category or "misc").rsplit("_", 1)[0])
+        for url, filename, category in rows
+    ]
+
+
+def get_documents_due(limit: int = REVALIDATE_PER_RUN) -> list[tuple]:
+    """Downloaded documents not validated within REVALIDATE_WINDOW_HOURS, oldest
+    first: (url, filename, category, file_hash, etag, last_modified, content_length).
+    URLs found dead within DEAD_URL_RECHECK_DAYS are left out."""
+    flush_downloads()
+    with _tracker() as conn:
+        return conn.execute(
+            """SELECT url, filename, category, file_hash, etag, last_modified, content_length
+               FROM downloads
+               WHERE status = 'success'
+                 AND COALESCE(validated_at, downloaded_at) < datetime('now', ?)
+                 AND url NOT IN (SELECT url FROM dead_urls WHERE last_seen >= datetime('now', ?))
+               ORDER BY COALESCE(validated_at, downloaded_at)
+               LIMIT ?""",
+            (f"-{REVALIDATE_WINDOW_HOURS} hours", f"-{DEAD_URL_RECHECK_DAYS} days", limit),
+        ).fetchall()
+
+
+def mark_validated(url: str, etag: str | None, last_modified: str | None,
+                   content_length: int | None):
+    """Stamp a document as checked, keeping validators the server did not send."""
+    with _tracker() as conn:
+        conn.execute(
+            """UPDATE downloads SET
+                   etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified),
+                   content_length = COALESCE(?, content_length),
+                   validated_at = CURRENT_TIMESTAMP
+               WHERE url = ?""",
+            (etag, last_modified, content_length, url),
+        )
+        conn.commit()
+
+
+# Don't lose a partly filled batch when the process exits normally
+atexit.register(flush_downloads)
+
+
+def get_page_validators(url: str) -> tuple[str | None, str | None, str] | None:
+    """Return (etag, last_modified, body_hash) for a page processed within
+    PAGE_CACHE_MAX_AGE_HOURS, else None so the page is fetched unconditionally."""
+    with _tracker() as conn:
+        row = conn.execute(
+            "SELECT etag, last_modified, body_hash FROM page_cache "
+            "WHERE url = ? AND (julianday('now') - julianday(fetched_at)) * 24 < ?",
+            (url, PAGE_CACHE_MAX_AGE_HOURS),
+        ).fetchone()
+    return row
+
+
+def save_page_validators(url: str, etag: str | None, last_modified: str | None, body_hash: str):
+    """Persist the validators of a freshly processed page; a different body
+    than last time counts as a change."""
+    with _tracker() as conn:
+        conn.execute(
+            """INSERT INTO page_cache (url, etag, last_modified, body_hash, fetched_at, checks, changes)
+               VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, 1, 0)
+               ON CONFLICT(url) DO UPDATE SET
+                   etag = excluded.etag, last_modified = excluded.last_modified,
+                   fetched_at = CURRENT_TIMESTAMP, checks = checks + 1,
+                   changes = changes + (body_hash IS NOT excluded.body_hash),
+                   body_hash = excluded.body_hash""",
+            (url, etag, last_modified, body_hash),
+        )
+        conn.commit()
+
+
+def record_page_unchanged(url: str):
+    """Count a visit that found the page unchanged."""
+    with _tracker() as conn:
+        conn.execute("UPDATE page_cache SET checks = checks + 1 WHERE url = ?", (url,))
+        conn.commit()
+
+
+def get_change_rates(urls: list[str]) -> dict[str, float]:
+    """Share of past visits on which each known page had changed."""
+    rates = {}
+    with _tracker() as conn:
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            rows = conn.execute(
+                f"SELECT url, changes, checks FROM page_cache WHERE checks > 0 "
+                f"AND url IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            rates.update((url, changes / checks) for url, changes, checks in rows)
+    return rates
+
+
+def save_page_outlinks(url: str, links: list[str], next_url: str | None = None):
+    """Remember a page's internal links and pagination Next link ("" for
+    none, None if unknown) so the deep crawl and category walks can go on
+    from it without re-fetching while the page is unchanged."""
+    with _tracker() as conn:
+        conn.execute(
+            "INSERT INTO page_cache (url, outlinks, next_url) VALUES (?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET outlinks = excluded.outlinks, next_url = excluded.next_url",
+            (url, json.dumps(links), next_url),
+        )
+        conn.commit()
+
+
+def get_page_outlinks(url: str) -> list[str] | None:
+    """Stored internal links of a page, or None if never recorded."""
+    with _tracker() as conn:
+        row = conn.execute("SELECT outlinks FROM page_cache WHERE url = ?", (url,)).fetchone()
+    return json.loads(row[0]) if row and row[0] else None
+
+
+def get_page_next_url(url: str) -> str | None:
+    """Stored Next link of a listing page ("" on its last page), or None if
+    never recorded."""
+    with _tracker() as conn:
+        row = conn.execute("SELECT next_url FROM page_cache WHERE url = ?", (url,)).fetchone()
+    return row[0] if row else None
+
+
+def swap_link_digest(url: str, digest: str) -> str | None:
+    """Store a listing page's link digest; returns the previous one."""
+    with _tracker() as conn:
+        row = conn.execute("SELECT link_digest FROM page_cache WHERE url = ?", (url,)).fetchone()
+        conn.execute(
+            "INSERT INTO page_cache (url, link_digest) VALUES (?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET link_digest = excluded.link_digest",
+            (url, digest),
+        )
+        conn.commit()
+    return row[0] if row else None
+
+
+def save_chain_pages(url: str, pages: int | None, stamp: bool = True):
+    """Record how many listing pages a complete walk from `url` took (None:
+    the listing has pages not known to be complete). stamp=False keeps the
+    time of the last complete walk, so the record still expires."""
+    with _tracker() as conn:
+        conn.execute(
+            "UPDATE page_cache SET chain_pages = ?, "
+            "chain_at = CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE chain_at END WHERE url = ?",
+            (pages, stamp, url),
+        )
+        conn.commit()
+
+
+def get_chain_pages(url: str) -> int | None:
+    """Pages of the listing's last complete walk, if it ran within
+    PAGE_CACHE_MAX_AGE_HOURS."""
+    with _tracker() as conn:
+        row = conn.execute(
+            "SELECT chain_pages FROM page_cache "
+            "WHERE url = ? AND (julianday('now') - julianday(chain_at)) * 24 < ?",
+            (url, PAGE_CACHE_MAX_AGE_HOURS),
+        ).fetchone()
+    return row[0] if row else None
+
+
+# Frontier states: pending → in_progress → done | failed. Rows survive a killed
+# process, so the next run_crawl resumes instead of re-walking finished pages.
+def _priority_score(url: str, depth: int, change_rate: float = 0.0) -> float:
+    """Frontier priority: the best PRIORITY_KEYWORDS match among the path's
+    words (plural/numbered forms included), plus CHANGE_PRIORITY_WEIGHT times
+    the page's past change rate, minus DEPTH_PENALTY per level."""
+    boost = 0
+    for word in re.split(r"[^a-z0-9]+", urlparse(url).path.lower()):
+        word = word.rstrip("0123456789")
+        if word.endswith("s"):
+            word = word[:-1]
+        boost = max(boost, PRIORITY_KEYWORDS.get(word, 0))
+    return boost + change_rate * CHANGE_PRIORITY_WEIGHT - depth * DEPTH_PENALTY
+
+
+def frontier_add(phase: str, entries: list[tuple[str, str]], depth: int = 0,
+                 priority: float | None = None):
+    """Queue (url, category) entries for a crawl phase; already-known URLs are kept as-is.
+    Priority defaults to _priority_score of each URL."""
+    rates = get_change_rates([url for url, _ in entries]) if priority is None else {}
+    with _tracker() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO frontier (phase, url, category, depth, priority, shard) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (phase, url, category, depth,
+                 _priority_score(url, depth, rates.get(url, 0.0)) if priority is None else priority,
+                 _shard_bucket(url))
+                for url, category in entries
+            ],
+        )
+        conn.commit()
+
+
+def frontier_resume(phase: str) -> int:
+    """Requeue rows interrupted mid-fetch or failed fewer than FRONTIER_MAX_ATTEMPTS
+    times. Returns the number of rows left to crawl."""
+    with _tracker() as conn:
+        # Only this worker's shard: other workers' in_progress rows are live
+        conn.execute(
+            "UPDATE frontier SET state = 'pending' WHERE phase = ? AND shard % ? = ? AND "
+            "(state = 'in_progress' OR (state = 'failed' AND attempts < ?))",
+            (phase, _shard[1], _shard[0], FRONTIER_MAX_ATTEMPTS),
+        )
+        conn.commit()
+        pending = conn.execute(
+            "SELECT COUNT(*) FROM frontier WHERE phase = ? AND state = 'pending'", (phase,)
+        ).fetchone()[0]
+        done = conn.execute(
+            "SELECT COUNT(*) FROM frontier WHERE phase = ? AND state = 'done'", (phase,)
+        ).fetchone()[0]
+    if done:
+        logger.info("Resuming %s crawl: %d pages already done, %d pending", phase, done, pending)
+    return pending
+
+
+def frontier_pending(phase: str, limit: int | None = None) -> list[tuple[str, str, int]]:
+    """Pending (url, category, depth) rows, highest priority first, then insertion
+    order. In a sharded run only this worker's shard is returned."""
+    index, count = _shard
+    with _tracker() as conn:
+        rows = conn.execute(
+            "SELECT url, category, depth FROM frontier WHERE phase = ? AND state = 'pending' "
+            "AND shard % ? = ? ORDER BY priority DESC, depth, rowid LIMIT ?",
+            (phase, count, index, -1 if limit is None else limit),
+        ).fetchall()
+    return rows
+
+
+def frontier_next(phase: str) -> tuple[str, str, int] | None:
+    """Claim the next pending row of a phase (marks it in_progress)."""
+    rows = frontier_pending(phase, limit=1)
+    if not rows:
+        return None
+    frontier_mark(phase, rows[0][0], "in_progress")
+    return rows[0]
+
+
+def frontier_wait_next(phase: str, deadline: float) -> tuple[str, str, int] | None:
+    """frontier_next for a sharded run: while this shard is empty but another
+    worker still has pages pending or in progress (which may queue links for
+    us), poll. Single-process runs return at once."""
+    while (entry := frontier_next(phase)) is None and _shard[1] > 1:
+        if time.monotonic() >= deadline:
+            return None
+        with _tracker() as conn:
+            busy = conn.execute(
+                "SELECT 1 FROM frontier WHERE phase = ? AND (state = 'in_progress' "
+                "OR (state = 'pending' AND shard % ? NOT IN "
+                "    (SELECT CAST(key AS INTEGER) FROM run_claims WHERE kind = ?))) LIMIT 1",
+                (phase, _shard[1], f"done:{phase}"),
+            ).fetchone()
+        if not busy:
+            return None
+        time.sleep(SHARD_POLL_SECONDS)
+    return entry
+
+
+def frontier_shard_done(phase: str):
+    """Tell the other workers of a sharded run that this one left `phase`;
+    rows still pending in its shard no longer keep them waiting."""
+    if _shard[1] > 1:
+        claim_for_run(f"done:{phase}", str(_shard[0]))
+
+
+def frontier_mark(phase: str, url: str, state: str, error: str | None = None):
+    """Move a frontier row to a new state; in_progress counts as an attempt."""
+    with _tracker() as conn:
+        conn.execute(
+            "UPDATE frontier SET state = ?, last_error = ?, updated_at = CURRENT_TIMESTAMP, "
+            "attempts = attempts + (? = 'in_progress') WHERE phase = ? AND url = ?",
+            (state, error, state, phase, url),
+        )
+        conn.commit()
+
+
+def frontier_clear():
+    """Forget the frontier once a crawl has run to completion."""
+    with _tracker() as conn:
+        conn.execute("DELETE FROM frontier")
+        conn.commit()
+
+
+# Detail pages (document-detail?documentId=…) never change once published, so
+# their attachment links are resolved once and then served from the tracker DB
+def _document_id(detail_url: str) -> str | None:
+    ids = parse_qs(urlsplit(detail_url).query).get("documentId")
+    return ids[0] if ids else None
+
+
+def get_detail_attachments(detail_url: str) -> list[tuple[str, str]] | None:
+    """Stored (url, ext) attachments of a detail page, or None if unresolved."""
+    doc_id = _document_id(detail_url)
+    if doc_id is None:
+        return None
+    with _tracker() as conn:
+        row = conn.execute(
+            "SELECT attachments FROM document_details WHERE document_id = ?", (doc_id,)
+        ).fetchone()
+    return [tuple(a) for a in json.loads(row[0])] if row else None
+
+
+def save_detail_attachments(detail_url: str, attachments: list[tuple[str, str]]):
+    doc_id = _document_id(detail_url)
+    if doc_id is None:
+        return
+    with _tracker() as conn:
+        conn.execute(
+            """INSERT OR REPLACE INTO document_details (document_id, detail_url, attachments)
+               VALUES (?, ?, ?)""",
+            (doc_id, detail_url, json.dumps(attachments)),
+        )
+        conn.commit()
+
+
+_dead_urls: set[str] = set()
+_dead_urls_lock = threading.Lock()
+
+
+def load_dead_urls():
+    """(Re)load URLs found dead (404/410) within DEAD_URL_RECHECK_DAYS."""
+    with _tracker() as conn:
+        rows = conn.execute(
+            "SELECT url FROM dead_urls WHERE last_seen >= datetime('now', ?)",
+            (f"-{DEAD_URL_RECHECK_DAYS} days",),
+        ).fetchall()
+    with _dead_urls_lock:
+        _dead_urls.clear()
+        _dead_urls.update(canonicalize_url(url) for (url,) in rows)
+
+
+def is_dead_url(url: str) -> bool:
+    return canonicalize_url(url) in _dead_urls
+
+
+def mark_dead_url(url: str, status: int):
+    """Remember a URL that returned a permanent 404/410."""
+    with _dead_urls_lock:
+        _dead_urls.add(canonicalize_url(url))
+    with _tracker() as conn:
+        conn.execute(
+            """INSERT INTO dead_urls (url, status) VALUES (?, ?)
+               ON CONFLICT(url) DO UPDATE SET
+                   status = excluded.status, last_seen = CURRENT_TIMESTAMP""",
+            (url, status),
+        )
+        conn.commit()
+
+
+def get_feed_entries(feed: str, sitemaps: bool = False) -> dict[str, str | None]:
+    """url → last seen timestamp of the entries a feed listed before
+    (sitemaps=True: the child sitemaps of a sitemap index instead)."""
+    with _tracker() as conn:
+        rows = conn.execute(
+            "SELECT url, lastmod FROM feed_entries WHERE feed = ? AND is_sitemap = ?",
+            (feed, int(sitemaps)),
+        ).fetchall()
+    return dict(rows)
+
+
+def save_feed_entries(feed: str, entries: list[tuple[str, str | None]], sitemaps: bool = False):
+    with _tracker() as conn:
+        conn.executemany(
+            """INSERT INTO feed_entries (url, feed, lastmod, is_sitemap) VALUES (?, ?, ?, ?)
+               ON CONFLICT(url) DO UPDATE SET
+                   feed = excluded.feed, lastmod = excluded.lastmod,
+                   is_sitemap = excluded.is_sitemap, last_seen = CURRENT_TIMESTAMP""",
+            [(url, feed, lastmod, int(sitemaps)) for url, lastmod in entries],
+        )
+        conn.commit()
+
+
+def enqueue_ready_document(path: Path, url: str, file_hash: str):
+    """Tell the ingestion worker a new document file is in place. Written
+    straight away (not buffered) so it is picked up within seconds."""
+    with _tracker() as conn:
+        conn.execute(
+            "INSERT INTO ingest_queue (path, url, file_hash) VALUES (?, ?, ?)",
+            (str(path), url, file_hash),
+        )
+        conn.commit()
+
+
+def claim_ready_documents(limit: int = 10) -> list[tuple[int, str, str | None]]:
+    """Take up to `limit` ready (id, path, file_hash) rows, oldest first."""
+    with _tracker() as conn:
+        rows = conn.execute(
+            """UPDATE ingest_queue SET state = 'in_progress', attempts = attempts + 1,
+                   updated_at = CURRENT_TIMESTAMP
+               WHERE id IN (SELECT id FROM ingest_queue WHERE state = 'ready' ORDER BY id LIMIT ?)
+               RETURNING id, path, file_hash""",
+            (limit,),
+        ).fetchall()
+        conn.commit()
+    return sorted(rows)
+
+
+def finish_ready_document(queue_id: int, error: str | None = None, max_attempts: int = 3):
+    """Mark a claimed row done, or put it back (failed after max_attempts)."""
+    with _tracker() as conn:
+        conn.execute(
+            """UPDATE ingest_queue SET last_error = ?, updated_at = CURRENT_TIMESTAMP,
+                   state = CASE WHEN ? IS NULL THEN 'done'
+                                WHEN attempts >= ? THEN 'failed' ELSE 'ready' END
+               WHERE id = ?""",
+            (error, error, max_attempts, queue_id),
+        )
+        conn.commit()
+
+
+def reset_ingest_queue(keep_days: float = 7) -> int:
+    """Requeue rows a stopped worker left in_progress and drop old done rows.
+    Returns the number of rows waiting."""
+    with _tracker() as conn:
+        conn.execute("UPDATE ingest_queue SET state = 'ready' WHERE state = 'in_progress'")
+        conn.execute(
+            "DELETE FROM ingest_queue WHERE state = 'done' AND updated_at < datetime('now', ?)",
+            (f"-{keep_days} days",),
+        )
+        conn.commit()
+        return conn.execute("SELECT COUNT(*) FROM ingest_queue WHERE state = 'ready'").fetchone()[0]
+
+
+_run_id = ""
+_pending_metrics: list[tuple] = []
+_metrics_lock = threading.Lock()
+
+
+def start_metrics_run(run_id: str | None = None) -> str:
+    """Tag the request metrics recorded from now on with a run id (a sharded
+    run passes the parent's id to its workers) and drop expired rows."""
+    global _run_id
+    _run_id = run_id or time.strftime("%Y%m%d-%H%M%S-") + uuid4().hex[:6]
+    with _tracker() as conn:
+        conn.execute(
+            "DELETE FROM request_metrics WHERE recorded_at < datetime('now', ?)",
+            (f"-{METRICS_RETENTION_DAYS} days",),
+        )
+        conn.commit()
+    return _run_id
+
+
+def record_request_metric(row: tuple):
+    """Buffer one (url, phase, status, bytes, dns, connect, ttfb, total,
+    retries, sleep) row; written in batches of RECORD_BATCH_SIZE."""
+    with _metrics_lock:
+        _pending_metrics.append((_run_id, *row))
+        full = len(_pending_metrics) >= RECORD_BATCH_SIZE
+    if full:
+        flush_request_metrics()
+
+
+def flush_request_metrics():
+    with _metrics_lock:
+        rows = list(_pending_metrics)
+        _pending_metrics.clear()
+    if not rows:
+        return
+    with _tracker() as conn:
+        conn.executemany(
+            """INSERT INTO request_metrics
+                   (run_id, url, phase, status, bytes, dns_ms, connect_ms, ttfb_ms,
+                    total_ms, retries, sleep_ms)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
+        conn.commit()
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(pct / 100 * len(values)) - 1))]
+
+
+def get_timing_summary(wall_seconds: float, run_id: str | None = None) -> dict:
+    """Where a run's time went: p50/p95 request latency per phase, throughput,
+    and seconds spent fetching, sleeping (rate limit, retry backoff) and
+    parsing. Fetch and sleep are summed over all threads/processes, so they
+    can exceed the wall-clock time."""
+    flush_request_metrics()
+    with _tracker() as conn:
+        rows = conn.execute(
+            "SELECT phase, bytes, ttfb_ms, total_ms, sleep_ms, retries FROM request_metrics "
+            "WHERE run_id = ?",
+            (run_id or _run_id,),
+        ).fetchall()
+    phases: dict[str, dict] = {}
+    for phase in sorted({row[0] for row in rows}):
+        mine = [row for row in rows if row[0] == phase]
+        totals = sorted(row[3] for row in mine)
+        ttfbs = sorted(row[2] for row in mine)
+        phases[phase] = {
+            "requests": len(mine),
+            "bytes":    sum(row[1] for row in mine),
+            "retries":  sum(row[5] for row in mine),
+            "p50_ms":   round(_percentile(totals, 50), 1),
+            "p95_ms":   round(_percentile(totals, 95), 1),
+            "ttfb_p50_ms": round(_percentile(ttfbs, 50), 1),
+        }
+    total_bytes = sum(row[1] for row in rows)
+    return {
+        "run_id":      run_id or _run_id,
+        "wall_s":      round(wall_seconds, 2),
+        "bytes":       total_bytes,
+        "bytes_per_s": round(total_bytes / wall_seconds) if wall_seconds > 0 else 0,
+        "fetch_s":     round(sum(row[3] for row in rows) / 1000, 2),
+        "sleep_s":     round(sum(row[4] for row in rows) / 1000, 2),
+        "parse_s":     round(get_run_stats().get("parse_seconds", 0), 2),
+        "phases":      phases,
+    }
 
 
 def get_download_stats() -> dict:
@@ -288,7 +1248,7 @@ def get_download_stats() -> dict:
     conn = sqlite3.connect(DB_PATH)
     try:
         rows = conn.execute(
-            "SELECT category, COUNT(*) FROM downloads GROUP BY category"
+            "SELECT category, COUNT(*) FROM downloads WHERE status = 'success' GROUP BY category"
         ).fetchall()
         return {r[0]: r[1] for r in rows}
     except sqlite3.OperationalError:
@@ -297,79 +1257,752 @@ def get_download_stats() -> dict:
         conn.close()
 
 
+# ─── HTTP Session Pool ─────────────────────────────────────────────────────────
+def _brotli_available() -> bool:
+    """urllib3 decodes `br` responses only when a brotli package is installed."""
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+# HTML pages are requested compressed; documents are fetched as raw bytes.
+# brotli is in requirements.txt – the check keeps a bare install on gzip
+HTML_ACCEPT_ENCODING = "gzip, deflate, br" if _brotli_available() else "gzip, deflate"
+
+_http_stats_lock = threading.Lock()
+_http_stats = {"requests": 0, "connections_opened": 0, "not_modified": 0}
+
+
+def _count_http(key: str, n: int = 1):
+    with _http_stats_lock:
+        _http_stats[key] += n
+
+
+def _connection_timings() -> dict:
+    """DNS/connect seconds spent by the current thread's request in flight."""
+    timings = getattr(_thread_local, "conn_timings", None)
+    if timings is None:
+        timings = _thread_local.conn_timings = {"dns": 0.0, "connect": 0.0}
+    return timings
+
+
+class _TimedConnectionMixin:
+    """Times name resolution and connection setup (TCP, plus TLS for HTTPS).
+
+    The host is resolved here, where the lookup can be timed, and each of its
+    addresses is handed to urllib3's own _new_conn in turn, falling back to
+    the next one as urllib3 does. TLS still verifies the original host name.
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(
+                host.strip("[]"), self.port, allowed_gai_family(), socket.SOCK_STREAM
+            )
+        except socket.gaierror as exc:
+            raise NewConnectionError(self, f"Failed to resolve '{host}' ({exc})") from exc
+        finally:
+            _connection_timings()["dns"] += time.perf_counter() - start
+        if not addresses:
+            raise NewConnectionError(self, f"No addresses found for '{host}'")
+        try:
+            for *_, sockaddr in addresses:
+                self._dns_host = sockaddr[0]
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError as exc:    # NewConnectionError included
+                    error = exc
+            raise error
+        finally:
+            self._dns_host = host
+
+    def connect(self):
+        timings = _connection_timings()
+        start, dns = time.perf_counter(), timings["dns"]
+        super().connect()
+        timings["connect"] += time.perf_counter() - start - (timings["dns"] - dns)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+    def _new_conn(self):
+        _count_http("connections_opened")
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+    def _new_conn(self):
+        _count_http("connections_opened")
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools count every new TCP/TLS connection."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http":  _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+_adapter: BaseAdapter | None = None
+_adapter_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def _shared_adapter() -> BaseAdapter:
+    """Process-wide connection pool shared by every session (wrapped for
+    recording, or replaced by the archive when replaying)."""
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            if REPLAY_ARCHIVE:
+                latency = None if REPLAY_LATENCY_MS == "recorded" else float(REPLAY_LATENCY_MS) / 1000
+                _adapter = ReplayAdapter(Path(REPLAY_ARCHIVE), latency)
+                logger.info("Replaying HTTP from %s", REPLAY_ARCHIVE)
+            else:
+                _adapter = PooledHTTPAdapter(
+                    pool_connections=4, pool_maxsize=HTTP_POOL_SIZE
+                )
+                if RECORD_ARCHIVE:
+                    _adapter = RecordingAdapter(_adapter, WarcWriter(Path(RECORD_ARCHIVE)))
+                    logger.info("Recording HTTP to %s", RECORD_ARCHIVE)
+        return _adapter
+
+
+def reset_http_transport():
+    """Drop the shared adapter, so the next request picks up changed
+    RECORD_ARCHIVE / REPLAY_ARCHIVE settings (sessions remount it)."""
+    global _adapter
+    with _adapter_lock:
+        if _adapter is not None:
+            _adapter.close()
+        _adapter = None
+
+
+def get_session() -> requests.Session:
+    """Return this thread's keep-alive session.
+
+    Sessions are per thread (cookies and headers are not thread-safe) but all
+    of them mount the same adapter, so connections are reused across threads.
+    """
+    session = getattr(_thread_local, "session", None)
+    adapter = _shared_adapter()
+    if session is None or session.adapters.get("https://") is not adapter:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _thread_local.session = session
+    return session
+
+
+def reset_http_stats():
+    """Zero the per-run connection counters."""
+    with _http_stats_lock:
+        for key in _http_stats:
+            _http_stats[key] = 0
+
+
+def get_http_stats() -> dict:
+    """Per-run connection reuse stats for the crawl summary."""
+    with _http_stats_lock:
+        requests_made = _http_stats["requests"]
+        opened = _http_stats["connections_opened"]
+        not_modified = _http_stats["not_modified"]
+    avoided = max(requests_made - opened, 0)
+    return {
+        "requests":           requests_made,
+        "connections_opened": opened,
+        "handshakes_avoided": avoided,
+        "reuse_ratio":        round(avoided / requests_made, 3) if requests_made else 0.0,
+        "pages_not_modified": not_modified,
+    }
+
+
+# ─── Politeness ────────────────────────────────────────────────────────────────
+class TokenBucket:
+    """Thread-safe token bucket. Tokens refill at `rate` per second up to `burst`.
+
+    acquire() reserves a token immediately (the balance may go negative) and
+    sleeps only for the debt, so concurrent callers queue up fairly and no
+    time is wasted when requests are already naturally spaced out.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available. Returns seconds slept."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def throttle(url: str) -> float:
+    """Wait for the host's rate limit before a request. Returns seconds slept."""
+    if CRAWL_RATE_PER_HOST <= 0:
+        return 0.0
+    host = urlparse(url).hostname or ""
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(CRAWL_RATE_PER_HOST, CRAWL_BURST)
+    return bucket.acquire()
+
+
+class CircuitBreaker:
+    """Per-host breaker: closed → open after `threshold` consecutive failures
+    → half-open (one trial request) once `cooldown` seconds have passed →
+    closed again, or down for the rest of the run if the trial fails."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.down = False
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._cond = threading.Condition()
+
+    def allow(self) -> bool:
+        """Wait until a request may go out. While the breaker is open the
+        caller sleeps out the cooldown; then one caller sends the trial request
+        and the rest wait for its outcome. False once the host is down or the
+        crawl budget ran out while waiting."""
+        with self._cond:
+            while not self.down:
+                if self._opened_at is None:
+                    return True
+                remaining = 1.0
+                if not self._trial:
+                    remaining = self.cooldown - (time.monotonic() - self._opened_at)
+                    if remaining <= 0:
+                        self._trial = True
+                        return True
+                if budget_exhausted():
+                    return False
+                self._cond.wait(min(remaining, 1.0))
+            return False
+
+    def success(self):
+        with self._cond:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+            self._cond.notify_all()
+
+    def failure(self) -> bool:
+        """Record a transient failure. Returns True if this opened the breaker
+        (a failed trial leaves it down instead)."""
+        with self._cond:
+            self._failures += 1
+            if self._trial:
+                self.down = True
+                self._cond.notify_all()
+                return False
+            if self._opened_at is None and self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def reset_breakers():
+    """Close every host's breaker; each run starts with all hosts up."""
+    with _buckets_lock:
+        _breakers.clear()
+
+
+def _breaker(url: str) -> CircuitBreaker:
+    host = urlparse(url).hostname or ""
+    with _buckets_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN)
+        return breaker
+
+
+# ─── Run Stats ─────────────────────────────────────────────────────────────────
+_run_stats: Counter = Counter()
+_run_stats_lock = threading.Lock()
+
+
+def count_stat(key: str, n: int = 1):
+    """Add to a per-run crawl counter (reported under summary["stats"])."""
+    with _run_stats_lock:
+        _run_stats[key] += n
+
+
+def reset_run_stats():
+    """Zero the per-run crawl and connection counters and close the breakers."""
+    with _run_stats_lock:
+        _run_stats.clear()
+    reset_http_stats()
+    reset_breakers()
+
+
+def get_run_stats() -> dict:
+    with _run_stats_lock:
+        return dict(_run_stats)
+
+
+class CrawlBudget:
+    """Wall-clock and byte limits of one crawl run (0 = unlimited)."""
+
+    def __init__(self, seconds: float = 0, max_bytes: int = 0):
+        self.deadline = time.monotonic() + seconds if seconds > 0 else None
+        self.max_bytes = max_bytes
+        self.hit = False
+
+    def exhausted(self) -> bool:
+        if not self.hit:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self.hit = "time"
+            elif self.max_bytes > 0:
+                with _run_stats_lock:
+                    if _run_stats["bytes_fetched"] >= self.max_bytes:
+                        self.hit = "bytes"
+            if self.hit:
+                count_stat("budget_exhausted")
+                logger.info("Crawl %s budget exhausted – deferring the rest to the next run", self.hit)
+        return bool(self.hit)
+
+    def stop(self, reason: str):
+        """End the run early; the rest is deferred as for a spent budget."""
+        if not self.hit:
+            self.hit = reason
+            count_stat("budget_exhausted")
+            logger.warning("Crawl stopped (%s) – deferring the rest to the next run", reason)
+
+
+_budget = CrawlBudget()
+
+
+def budget_exhausted() -> bool:
+    return _budget.exhausted()
+
+
+# ─── URL Canonicalization ──────────────────────────────────────────────────────
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL into a de-duplication key (the original URL is still
+    what gets fetched).
+
+    Lower-cases scheme and host, folds `www.` and http→https, drops default
+    ports and the fragment, collapses repeated slashes, strips trailing
+    slashes (except the root), folds SITE_PATH_ALIASES and sorts the query
+    parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        return url
+    netloc = host if port in (None, _DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+    if scheme == "http":
+        scheme = "https"
+
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    for alias in SITE_PATH_ALIASES:
+        if path == alias or path.startswith(alias + "/"):
+            path = path[len(alias):] or "/"
+            break
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+class VisitedRegistry:
+    """Run-wide set of canonical page URLs already fetched by any phase."""
+
+    def __init__(self):
+        self._urls: dict[str, str] = {}     # canonical URL → URL actually fetched
+        self._lock = threading.Lock()
+
+    def claim(self, url: str) -> bool:
+        """True the first time a page is seen this run; later claims are
+        counted as duplicate fetches avoided."""
+        key = canonicalize_url(url)
+        with self._lock:
+            duplicate = key in self._urls
+            if not duplicate:
+                self._urls[key] = url
+        if not duplicate and not claim_for_run("page", key):
+            duplicate = True     # another worker of a sharded run fetched it
+        if duplicate:
+            count_stat("duplicate_fetches_avoided")
+        return not duplicate
+
+    def fetched_as(self, url: str) -> str:
+        """The spelling under which this page was fetched this run (else `url`)."""
+        with self._lock:
+            return self._urls.get(canonicalize_url(url), url)
+
+    def reset(self):
+        with self._lock:
+            self._urls.clear()
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+
+_visited_pages = VisitedRegistry()
+
+
 # ─── HTTP Helpers ──────────────────────────────────────────────────────────────
-def fetch_with_retry(url: str, stream: bool = False) -> requests.Response | None:
-    """GET request with exponential backoff retry."""
+def _retry_after(resp: requests.Response) -> float | None:
+    """Seconds requested by a Retry-After header (delta or HTTP date), capped."""
+    value = resp.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        wait = float(value)
+    else:
+        try:
+            wait = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(wait, 0.0), RETRY_AFTER_MAX)
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with jitter (half fixed, half random)."""
+    wait = min(BACKOFF_BASE ** attempt, BACKOFF_MAX)
+    return wait / 2 + random.uniform(0, wait / 2)
+
+
+class RequestMetric:
+    """Timings of one fetch_with_retry call, across all its attempts."""
+    __slots__ = ("url", "phase", "status", "bytes", "dns", "connect", "ttfb",
+                 "retries", "sleep", "started")
+
+    def __init__(self, url: str, phase: str):
+        self.url, self.phase = url, phase
+        self.status, self.bytes, self.retries = None, 0, 0
+        self.dns = self.connect = self.ttfb = self.sleep = 0.0
+        self.started = time.perf_counter()
+
+    def attempt_done(self, resp: requests.Response | None, timings: dict):
+        self.dns += timings["dns"]
+        self.connect += timings["connect"]
+        if resp is not None:
+            self.status = resp.status_code
+            self.ttfb = max(0.0, resp.elapsed.total_seconds() - timings["dns"] - timings["connect"])
+
+    def record(self):
+        """Store the metric; total is the time spent fetching, sleep excluded."""
+        total = time.perf_counter() - self.started - self.sleep
+        record_request_metric((
+            self.url, self.phase, self.status, self.bytes,
+            round(self.dns * 1000, 2), round(self.connect * 1000, 2),
+            round(self.ttfb * 1000, 2), round(total * 1000, 2),
+            self.retries, round(self.sleep * 1000, 2),
+        ))
+
+
+def close_response(resp: requests.Response):
+    """Close a streamed response from fetch_with_retry and record its metric
+    (the body, if read, counted through resp.metric.bytes)."""
+    resp.close()
+    if (metric := getattr(resp, "metric", None)) is not None:
+        resp.metric = None
+        metric.record()
+
+
+def fetch_with_retry(url: str, stream: bool = False, headers: dict | None = None,
+                     phase: str = "page", accept: tuple[int, ...] = ()) -> requests.Response | None:
+    """GET request over the pooled session with status-aware retry.
+
+    404/410 are not retried and the URL is remembered as dead; other 4xx fail
+    at once. 408/425/429, 5xx and connection errors are retried with jittered
+    exponential backoff, honouring Retry-After. Repeated transient failures
+    open the host's circuit breaker, which pauses requests to it; if the host
+    is still failing after the pause, the rest of the run is deferred.
+
+    Statuses in `accept` are returned like a success instead of failing.
+    Every call is recorded in request_metrics under `phase`; a streamed
+    response carries its RequestMetric as `resp.metric` until close_response.
+    """
+    if is_dead_url(url):
+        count_stat("dead_urls_skipped")
+        return None
+    headers = {
+        "Accept-Encoding": "identity" if stream else HTML_ACCEPT_ENCODING,
+        **(headers or {}),
+    }
+    breaker = _breaker(url)
+    metric = RequestMetric(url, phase)
     for attempt in range(1, MAX_RETRIES + 1):
+        if not breaker.allow():
+            count_stat("circuit_open_skips")
+            if attempt > 1:
+                metric.record()
+            return None
+        wait = None
+        timings = _connection_timings()
+        timings["dns"] = timings["connect"] = 0.0
         try:
-            resp = requests.get(
-                url, headers=HEADERS, stream=stream,
+            metric.sleep += throttle(url)
+            _count_http("requests")
+            resp = get_session().get(
+                url, headers=headers, stream=stream,
                 timeout=30, allow_redirects=True
             )
-            resp.raise_for_status()
+            metric.attempt_done(resp, timings)
+            if resp.status_code not in accept:
+                resp.raise_for_status()
+            breaker.success()
+            if stream:
+                resp.metric = metric
+            else:
+                metric.bytes = len(resp.content)
+                metric.record()
             return resp
+        except requests.HTTPError as exc:
+            status = exc.response.status_code
+            exc.response.close()
+            if status in DEAD_STATUSES or (status < 500 and status not in RETRY_STATUSES):
+                metric.record()
+            if status in DEAD_STATUSES:
+                breaker.success()
+                mark_dead_url(url, status)
+                logger.warning("Dead URL (%d), not retrying: %s", status, url)
+                return None
+            if status < 500 and status not in RETRY_STATUSES:
+                breaker.success()
+                logger.error("HTTP %d for %s – not retrying", status, url)
+                return None
+            wait = _retry_after(exc.response)
+            error = exc
         except requests.RequestException as exc:
-            wait = BACKOFF_BASE ** attempt
-            logger.warning(
-                "Attempt %d/%d failed for %s: %s. Retrying in %ds…",
-                attempt, MAX_RETRIES, url, exc, wait
-            )
-            if attempt < MAX_RETRIES:
-                time.sleep(wait)
+            metric.attempt_done(None, timings)
+            error = exc
+
+        if breaker.failure():
+            logger.warning("Circuit opened for %s – pausing it for %.0fs",
+                           urlparse(url).hostname, breaker.cooldown)
+        elif breaker.down:
+            count_stat("hosts_down")
+            _budget.stop(f"{urlparse(url).hostname} down")
+            metric.record()
+            return None
+        if attempt == MAX_RETRIES:
+            break
+        if wait is None:
+            wait = _backoff(attempt)
+        logger.warning(
+            "Attempt %d/%d failed for %s: %s. Retrying in %.1fs…",
+            attempt, MAX_RETRIES, url, error, wait
+        )
+        count_stat("retries")
+        metric.retries += 1
+        metric.sleep += wait
+        time.sleep(wait)
+    metric.record()
     logger.error("All retries exhausted for %s", url)
     return None
 
 
-# ─── PDF Crawler ───────────────────────────────────────────────────────────────
-def extract_doc_links(html: str, base_url: str) -> list[tuple[str, str]]:
-    """Extract all document links (PDF, Excel, Word) from a page.
-    Returns list of (full_url, extension) tuples.
+_held_validators: dict[str, tuple[str | None, str | None, str]] = {}
+_held_lock = threading.Lock()
+
+
+def release_page_validators(url: str, complete: bool):
+    """Save the validators fetch_page(hold=True) kept back for a page once its
+    documents are all downloaded or skipped (complete=True). Otherwise they
+    are dropped, so the next run processes the page again."""
+    with _held_lock:
+        validators = _held_validators.pop(url, None)
+    if validators is not None and complete:
+        save_page_validators(url, *validators)
+    elif validators is not None:
+        count_stat("pages_incomplete")
+
+
+def fetch_page(url: str, conditional: bool = True, phase: str = "page",
+               hold: bool = False) -> str | None:
+    """Fetch an HTML page. Returns its HTML, "" when the page is unchanged since
+    the last run, or None when the fetch failed.
+
+    Pages already fetched this run by any phase (same canonical URL) count as
+    unchanged. Otherwise sends If-None-Match / If-Modified-Since from the page
+    cache and also compares the body hash, so unchanged pages skip link
+    extraction entirely. conditional=False always fetches, bypassing both the
+    run registry and the page cache. hold=True keeps a changed page's new
+    validators back until release_page_validators.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    links = []
-    for tag in soup.find_all("a", href=True):
-        href = tag["href"].strip()
+    if conditional and not _visited_pages.claim(url):
+        logger.debug("Already fetched this run: %s", url)
+        return ""
+
+    cached = get_page_validators(url) if conditional else None
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    resp = fetch_with_retry(url, headers=headers, phase=phase)
+    if not resp:
+        return None
+    if not conditional:
+        count_stat("pages_fetched")
+        count_stat("bytes_fetched", len(resp.content))
+        return resp.text
+
+    count_stat("bytes_fetched", len(resp.content))
+    body_hash = hashlib.sha256(resp.content).hexdigest()
+    if resp.status_code == 304 or (cached and cached[2] == body_hash):
+        _count_http("not_modified")
+        record_page_unchanged(url)
+        logger.debug("Unchanged since last run: %s", url)
+        return ""
+
+    validators = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"), body_hash)
+    if hold:
+        with _held_lock:
+            _held_validators[url] = validators
+    else:
+        save_page_validators(url, *validators)
+    count_stat("pages_fetched")
+    return resp.text
+
+
+# ─── PDF Crawler ───────────────────────────────────────────────────────────────
+class PageLinks(NamedTuple):
+    """Everything the crawler needs from one page, from a single parse."""
+    doc_links:      list[tuple[str, str]]   # (full_url, extension)
+    detail_links:   list[str]               # document-detail?documentId=… pages
+    next_url:       str | None              # pagination "Next" link
+    internal_links: list[str]               # internal links for deep crawling
+
+
+_NEXT_LABELS = ("next", "next page", "›", "»")
+_NO_LINKS = PageLinks([], [], None, [])
+
+
+def _parse_html(html: str):
+    """Parse HTML with lxml; returns None for empty documents."""
+    try:
+        return lxml.html.fromstring(html)
+    except ValueError:
+        # Unicode strings carrying an XML encoding declaration must be parsed as bytes
+        return _parse_html(html.encode("utf-8"))
+    except lxml.etree.ParserError:
+        return None
+
+
+def extract_page_links(html: str, base_url: str) -> PageLinks:
+    """Parse a page once and pull out document links, document-detail links,
+    the next-page URL and internal links in a single pass over its anchors."""
+    start = time.perf_counter()
+    root = _parse_html(html) if html else None
+    if root is None:
+        return _NO_LINKS
+
+    doc_links: dict[tuple[str, str], None] = {}
+    detail_links: dict[str, None] = {}
+    internal_links: dict[str, None] = {}
+    next_url = None
+
+    for tag in root.iter("a"):
+        href = tag.get("href")
+        if href is None:
+            continue
+        href = href.strip()
+
+        if "document-detail" in href and "documentId" in href:
+            detail_links[urljoin(base_url, href)] = None
         if href.startswith("javascript"):
             continue
+
         hl = href.lower()
         for ext in DOC_TYPES:
             if ext in hl:
-                full = urljoin(base_url, href)
-                links.append((full, ext))
+                doc_links[(urljoin(base_url, href), ext)] = None
                 break
-    return list(set(links))
+
+        if next_url is None:
+            text = "".join(t.strip() for t in tag.itertext()).lower()
+            if text in _NEXT_LABELS:
+                next_url = urljoin(base_url, href)
+
+        if href.startswith("#") or href.startswith("mailto"):
+            continue
+        if href.startswith("/") or "irdai.gov.in" in href:
+            internal_links[urljoin(base_url, href)] = None
+
+    count_stat("parse_seconds", time.perf_counter() - start)
+    return PageLinks(list(doc_links), list(detail_links), next_url, list(internal_links))
+
+
+def extract_doc_links(html: str, base_url: str) -> list[tuple[str, str]]:
+    """Extract all document links (PDF, Excel, Word) from a page.
+    Returns list of (full_url, extension) tuples.
+    """
+    return extract_page_links(html, base_url).doc_links
 
 
 def extract_document_detail_links(html: str, base_url: str) -> list[str]:
     """Extract document-detail page links that may contain PDFs."""
-    soup = BeautifulSoup(html, "html.parser")
-    links = []
-    for tag in soup.find_all("a", href=True):
-        href = tag["href"].strip()
-        if "document-detail" in href and "documentId" in href:
-            full = urljoin(base_url, href)
-            links.append(full)
-    return list(set(links))
+    return extract_page_links(html, base_url).detail_links
 
 
 def get_next_page_url(html: str, current_url: str) -> str | None:
     """Find pagination 'Next' link if present."""
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup.find_all("a", href=True):
-        href = tag["href"].strip()
-        if href.startswith("javascript"):
-            continue
-        text = tag.get_text(strip=True).lower()
-        if text in ("next", "next page", "›", "»"):
-            return urljoin(current_url, href)
-    return None
+    return extract_page_links(html, current_url).next_url
 
 
 def _extract_doc_filename(url: str, ext: str) -> str:
     """Extract a clean filename from IRDAI URL patterns.
     Sanitizes non-ASCII characters for cross-platform compatibility.
     """
-    import re
     from urllib.parse import unquote
     parsed = urlparse(url)
     path_parts = parsed.path.split("/")
@@ -383,14 +2016,173 @@ def _extract_doc_filename(url: str, ext: str) -> str:
     return f"doc_{hashlib.md5(url.encode()).hexdigest()[:8]}{ext}"
 
 
-def download_document(url: str, ext: str, category: str) -> bool:
-    """Download a single document (PDF/Excel/Word); returns True if new file saved."""
-    if is_already_downloaded(url):
-        logger.debug("Already downloaded: %s", url)
-        return False
+_blob_lock = threading.Lock()
 
-    resp = fetch_with_retry(url, stream=True)
-    if not resp:
+
+def _blob_path(file_hash: str) -> Path:
+    return BLOB_DIR / file_hash[:2] / file_hash
+
+
+def store_blob(tmp: Path, file_hash: str, dest: Path, replace: bool = False) -> bool:
+    """Move a downloaded temp file into the content-addressed store.
+
+    New content is hardlinked to `dest` (copied if the filesystem can't link)
+    so ingestion finds it under its category. Content that is already stored
+    only gets a downloads row, so it costs no disk and is never re-ingested.
+    replace=True (a forced re-download) links stored content over `dest`
+    too, as the file there is an older version of the document.
+    Returns True if `dest` was written.
+    """
+    blob = _blob_path(file_hash)
+    with _blob_lock:
+        if blob.exists():
+            tmp.unlink(missing_ok=True)
+            if not replace or (dest.exists() and os.path.samefile(blob, dest)):
+                return False
+        else:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, blob)
+    # Link/copy beside `dest` and rename over it, so ingestion never sees a
+    # missing or half-copied file
+    staging = dest.with_name(f".{dest.name}.{uuid4().hex[:8]}.tmp")
+    try:
+        os.link(blob, staging)
+    except OSError:
+        shutil.copy2(blob, staging)
+    os.replace(staging, dest)
+    return True
+
+
+# Interrupted downloads stay in PARTIAL_DIR under a name derived from the URL,
+# with a .json sidecar (url, ext, category, validator) so any later attempt –
+# this run or the next – continues them with a Range request
+PARTIAL_DIR = BLOB_DIR / "partial"
+
+
+def _partial_path(url: str) -> Path:
+    return PARTIAL_DIR / hashlib.sha256(url.encode()).hexdigest()
+
+
+def _discard_partial(part: Path):
+    part.unlink(missing_ok=True)
+    part.with_suffix(".json").unlink(missing_ok=True)
+
+
+def _resume_headers(part: Path) -> dict:
+    """Range / If-Range headers continuing a partial download, or {}."""
+    offset = part.stat().st_size if part.exists() else 0
+    if not offset:
+        return {}
+    headers = {"Range": f"bytes={offset}-"}
+    try:
+        validator = json.loads(part.with_suffix(".json").read_text()).get("validator")
+    except (OSError, ValueError):
+        validator = None
+    if validator:
+        # Server sends the whole file instead if it changed since
+        headers["If-Range"] = validator
+    return headers
+
+
+def get_partial_downloads() -> list[tuple[str, str, str]]:
+    """(url, ext, category) of downloads interrupted by an earlier run."""
+    partials = []
+    for meta in PARTIAL_DIR.glob("*.json"):
+        try:
+            info = json.loads(meta.read_text())
+            partials.append((info["url"], info["ext"], info["category"]))
+        except (OSError, ValueError, KeyError):
+            continue
+    return partials
+
+
+# Leading bytes of each document type; .csv is plain text and has none
+_MAGIC_BYTES = {
+    ".pdf":  (b"%PDF-",),
+    ".xlsx": (b"PK\x03\x04",),
+    ".docx": (b"PK\x03\x04",),
+    ".xls":  (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", b"PK\x03\x04"),
+    ".doc":  (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", b"PK\x03\x04"),
+}
+_SNIFF_BYTES = 1024     # PDF allows junk before %PDF- within the first 1 KB
+
+
+def _content_mismatch(ext: str, content_type: str, head: bytes) -> str | None:
+    """Why a response is not the expected document, or None if it looks right."""
+    mime = content_type.split(";")[0].strip().lower()
+    if mime in ("text/html", "application/xhtml+xml"):
+        return f"content-type {mime}"
+    start = head.lstrip()[:64].lower()
+    if start.startswith((b"<!doctype html", b"<html", b"<?xml")):
+        return "HTML body"
+    magic = _MAGIC_BYTES.get(ext)
+    if magic is None:
+        return None
+    if ext == ".pdf":
+        return None if magic[0] in head else "missing %PDF- header"
+    return None if head.startswith(magic) else f"bad {ext} signature"
+
+
+def _stream_download(resp: requests.Response, part: Path, url: str, ext: str,
+                     category: str) -> tuple[str | None, str, int]:
+    """Stream a response into the partial file, appending when the server
+    honoured our Range request. The first bytes are checked against the
+    expected type before anything else is written.
+
+    Returns (mismatch reason or None, sha256 of the whole file, size).
+    Raises OSError / RequestException if the transfer is interrupted.
+    """
+    offset = part.stat().st_size if part.exists() else 0
+    resumed = (
+        offset > 0 and resp.status_code == 206
+        and resp.headers.get("Content-Range", "").startswith(f"bytes {offset}-")
+    )
+    sha256 = hashlib.sha256()
+    head = b""
+    if resumed:
+        with open(part, "rb") as fh:
+            head = fh.read(_SNIFF_BYTES)
+            sha256.update(head)
+            for block in iter(lambda: fh.read(DOWNLOAD_BUFFER_SIZE), b""):
+                sha256.update(block)
+        count_stat("resumed_downloads")
+        count_stat("resume_bytes_saved", offset)
+        logger.info("Resuming %s at byte %d", url, offset)
+    else:
+        offset = 0
+        etag = resp.headers.get("ETag", "")
+        validator = etag if etag and not etag.startswith("W/") else resp.headers.get("Last-Modified")
+        part.with_suffix(".json").write_text(json.dumps({
+            "url": url, "ext": ext, "category": category, "validator": validator,
+        }))
+
+    content_type = resp.headers.get("Content-Type", "")
+    mismatch = None
+    size = offset
+    with open(part, "ab" if resumed else "wb", buffering=DOWNLOAD_BUFFER_SIZE) as fh:
+        for chunk in resp.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE):
+            if len(head) < _SNIFF_BYTES:
+                head += chunk
+                if len(head) >= _SNIFF_BYTES:
+                    mismatch = _content_mismatch(ext, content_type, head)
+                    if mismatch:
+                        break
+            fh.write(chunk)
+            sha256.update(chunk)
+            size += len(chunk)
+    count_stat("bytes_fetched", size - offset)
+    if (metric := getattr(resp, "metric", None)) is not None:
+        metric.bytes = size - offset
+    if mismatch is None and len(head) < _SNIFF_BYTES:
+        mismatch = _content_mismatch(ext, content_type, head)
+    return mismatch, sha256.hexdigest(), size
+
+
+def download_document(url: str, ext: str, category: str, force: bool = False) -> bool:
+    """Download a single document (PDF/Excel/Word); returns True if new file saved.
+    force=True downloads a known URL again (its content changed upstream)."""
+    if not force and is_already_downloaded(url):
+        logger.debug("Already downloaded: %s", url)
         return False
 
     # Determine target directory and filename
@@ -400,69 +2192,464 @@ def download_document(url: str, ext: str, category: str) -> bool:
         filename += ext
     dest = target_dir / category / filename
     dest.parent.mkdir(parents=True, exist_ok=True)
+    file_type = _classify(ext)
 
-    # Stream write + hash
-    sha256 = hashlib.sha256()
-    try:
-        with open(dest, "wb") as fh:
-            for chunk in resp.iter_content(chunk_size=8192):
-                fh.write(chunk)
-                sha256.update(chunk)
-    except OSError as exc:
-        logger.error("Failed to write %s: %s", dest, exc)
+    part = _partial_path(url)
+    part.parent.mkdir(parents=True, exist_ok=True)
+    for attempt in range(1, MAX_RETRIES + 1):
+        headers = _resume_headers(part)
+        resp = fetch_with_retry(url, stream=True, headers=headers, phase="download",
+                                accept=(416,) if headers else ())
+        if resp is None:
+            # Transient failure or circuit open: a partial file stays for the next run
+            return False
+        if headers and (resp.status_code == 416 or (
+                resp.status_code == 206
+                and not resp.headers.get("Content-Range", "").startswith(f"bytes {headers['Range'][6:]}"))):
+            # Server rejected the resume (a 200 or changed If-Range simply
+            # restarts the file in _stream_download): start over
+            close_response(resp)
+            logger.info("Resume of %s rejected (HTTP %d) – restarting", url, resp.status_code)
+            _discard_partial(part)
+            continue
+        try:
+            mismatch, file_hash, size = _stream_download(resp, part, url, ext, category)
+            etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+            break
+        except (OSError, requests.RequestException) as exc:
+            logger.warning("Download of %s interrupted (%s) – attempt %d/%d",
+                           url, exc, attempt, MAX_RETRIES)
+        finally:
+            close_response(resp)
+    else:
+        logger.error("Giving up on %s for this run; the partial file is kept", url)
+        return False
+
+    if mismatch:
+        _discard_partial(part)
+        record_invalid_download(url, filename, f"{category}_{file_type}", mismatch)
+        count_stat("invalid_documents")
+        logger.warning("Rejected %s (%s) – will retry next run", url, mismatch)
         return False
 
-    file_type = "pdf" if ext == ".pdf" else ("excel" if ext in (".xlsx", ".xls", ".csv") else "word")
-    record_download(url, filename, f"{category}_{file_type}", sha256.hexdigest())
+    part.with_suffix(".json").unlink(missing_ok=True)
+    is_new = store_blob(part, file_hash, dest, replace=force)
+    record_download(url, filename, f"{category}_{file_type}", file_hash,
+                    etag, last_modified, size)
+    if not is_new:
+        count_stat("duplicate_documents")
+        count_stat("duplicate_bytes_saved", size)
+        logger.info("Duplicate content [%s/%s] %s – already stored", category, file_type, filename)
+        return False
+    enqueue_ready_document(dest, url, file_hash)
     logger.info("Downloaded [%s/%s] %s", category, file_type, filename)
     return True
 
 
-def crawl_category(category: str, path: str, max_pages: int = 20) -> dict:
-    """Crawl a single IRDAI category. Returns counts by doc type."""
-    url = BASE_URL + path
-    counts = {"pdf": 0, "excel": 0, "word": 0}
+def _document_settled(url: str) -> bool:
+    """True once a document needs nothing more from its page: downloaded,
+    dead, or left for the next run's phase 0 (rejected content, partial file)."""
+    return (
+        is_already_downloaded(url) or is_dead_url(url)
+        or _partial_path(url).with_suffix(".json").exists() or is_invalid_download(url)
+    )
 
-    for page_num in range(1, max_pages + 1):
-        logger.info("Crawling %s – page %d: %s", category, page_num, url)
-        resp = fetch_with_retry(url)
-        if not resp:
-            break
 
-        # 1. Direct document links on the page
-        doc_links = extract_doc_links(resp.text, url)
-        logger.info("Found %d document links on page %d", len(doc_links), page_num)
-
-        for doc_url, ext in doc_links:
-            if download_document(doc_url, ext, category):
-                counts[_classify(ext)] += 1
-            time.sleep(0.3)
-
-        # 2. Follow document-detail pages
-        detail_links = extract_document_detail_links(resp.text, url)
-        logger.info("Found %d document-detail links on page %d", len(detail_links), page_num)
-
-        for detail_url in detail_links:
-            try:
-                detail_resp = fetch_with_retry(detail_url)
-                if detail_resp:
-                    inner_docs = extract_doc_links(detail_resp.text, detail_url)
-                    for doc_url, ext in inner_docs:
-                        if download_document(doc_url, ext, category):
-                            counts[_classify(ext)] += 1
-                        time.sleep(0.3)
-            except Exception as exc:
-                logger.warning("Error following detail page %s: %s", detail_url[:80], exc)
-            time.sleep(0.3)
-
-        next_url = get_next_page_url(resp.text, url)
-        if not next_url or next_url == url:
-            logger.info("No more pages for %s", category)
-            break
-        url = next_url
-        time.sleep(1)
+class PageTicket:
+    """The documents one fetched page queued. When the last of them finishes
+    the page's held validators are released: saved if every document was
+    downloaded or skipped, dropped if any failed. The `with` block around
+    the submits keeps the ticket open until the page is fully queued."""
+
+    def __init__(self, url: str, pipeline: "DownloadPipeline"):
+        self.url = url
+        self.failed = False
+        self._pipeline = pipeline
+        self._pending = 1
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_):
+        self.done(exc_type is None)
+
+    def add(self):
+        with self._lock:
+            self._pending += 1
+
+    def fail(self):
+        with self._lock:
+            self.failed = True
+
+    def done(self, ok: bool):
+        with self._lock:
+            self.failed = self.failed or not ok
+            self._pending -= 1
+            finished = self._pending == 0
+        if finished:
+            self._finish(not self.failed)
+
+    def _finish(self, complete: bool):
+        release_page_validators(self.url, complete)
+        if not complete:
+            with self._pipeline._lock:
+                self._pipeline.incomplete_pages.add(self.url)
+
+
+class FeedEntryTicket(PageTicket):
+    """PageTicket for an entry of the feed `feed` (itself a page ticket): the
+    entry's timestamp is recorded only once the documents it led to are in,
+    and the feed's validators only once all its entries are. A failed entry
+    is therefore new or changed again next time."""
+
+    def __init__(self, url: str, pipeline: "DownloadPipeline", feed: PageTicket,
+                 lastmod: str | None):
+        super().__init__(url, pipeline)
+        self.feed = feed
+        self.lastmod = lastmod
+        feed.add()
+
+    def _finish(self, complete: bool):
+        super()._finish(complete)
+        if complete:
+            save_feed_entries(self.feed.url, [(self.url, self.lastmod)])
+        else:
+            count_stat("feed_entries_incomplete")
+        self.feed.done(complete)
+
+
+class DownloadPipeline:
+    """Bounded queue of document URLs drained by a pool of download workers.
+
+    Page parsers submit() documents while the workers stream files to disk, so
+    discovery and download overlap. A full queue blocks the producer
+    (backpressure). Leaving the `with` block waits for the queue to drain;
+    `counts` then holds the new documents by type and `incomplete_pages` the
+    pages (see page()) with a document that failed.
+    """
+
+    def __init__(self, workers: int = DOWNLOAD_WORKERS, maxsize: int = DOWNLOAD_QUEUE_SIZE):
+        self.counts = {"pdf": 0, "excel": 0, "word": 0}
+        self.incomplete_pages: set[str] = set()
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self._submitted: set[str] = set()
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._work, daemon=True, name=f"irdai-download-{i}")
+            for i in range(max(1, workers))
+        ]
+
+    def __enter__(self):
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def page(self, url: str) -> PageTicket:
+        """Ticket for the documents of a page fetched with hold=True."""
+        return PageTicket(url, self)
+
+    def submit(self, url: str, ext: str, category: str, force: bool = False,
+               page: PageTicket | None = None):
+        """Queue a document (once per pipeline); blocks while the queue is full.
+        force=True downloads it again even if it is already known; `page` is
+        told the outcome."""
+        key = canonicalize_url(url)
+        with self._lock:
+            if key in self._submitted:
+                return
+            self._submitted.add(key)
+        if not claim_for_run("document", key):
+            return
+        if page is not None:
+            page.add()
+        self._queue.put((url, ext, category, force, page))
+
+    def _work(self):
+        while (item := self._queue.get()) is not None:
+            url, ext, category, force, page = item
+            ok = False
+            if budget_exhausted():
+                frontier_add("download", [(url, category)])
+                frontier_mark("download", url, "pending")
+                count_stat("downloads_deferred")
+            else:
+                try:
+                    if download_document(url, ext, category, force):
+                        with self._lock:
+                            self.counts[_classify(ext)] += 1
+                    ok = _document_settled(url)
+                except Exception as exc:
+                    logger.warning("Download failed for %s: %s", url[:80], exc)
+            if page is not None:
+                page.done(ok)
+
+
+def _detail_attachments_from_html(detail_url: str, html: str) -> list[tuple[str, str]]:
+    """Extract a freshly fetched detail page's attachments and memoize them.
+    Pages without attachments are not stored, so they are retried next run."""
+    attachments = extract_doc_links(html, detail_url)
+    if attachments:
+        save_detail_attachments(detail_url, attachments)
+    return attachments
+
+
+def resolve_detail_page(detail_url: str) -> list[tuple[str, str]] | None:
+    """Attachment (url, ext) links of a document-detail page: from the tracker
+    DB when its documentId is known, otherwise fetched once and stored.
+    None if the page could not be fetched."""
+    attachments = get_detail_attachments(detail_url)
+    if attachments is not None:
+        count_stat("detail_pages_memoized")
+        return attachments
+    html = fetch_page(detail_url, conditional=False, phase="detail")
+    return _detail_attachments_from_html(detail_url, html) if html is not None else None
+
+
+def _queue_page_documents(links: PageLinks, category: str, pipeline: DownloadPipeline,
+                          page: PageTicket):
+    """Submit a page's documents, and those on its document-detail pages."""
+    for doc_url, ext in links.doc_links:
+        pipeline.submit(doc_url, ext, category, page=page)
+    for detail_url in links.detail_links:
+        try:
+            attachments = resolve_detail_page(detail_url)
+        except Exception as exc:
+            logger.warning("Error following detail page %s: %s", detail_url[:80], exc)
+            attachments = None
+        if attachments is None:
+            page.fail()
+            continue
+        for doc_url, ext in attachments:
+            pipeline.submit(doc_url, ext, category, page=page)
+
+
+def _crawl_page_html(url: str, html: str, category: str, pipeline: DownloadPipeline,
+                     links: PageLinks | None = None, page: PageTicket | None = None) -> PageLinks:
+    """Extract a fetched page's links, store its outlinks and queue its
+    documents. The validators fetch_page(hold=True) kept for the page are
+    saved once those documents are all downloaded or skipped. An open ticket
+    the caller passes as `page` is told the outcome instead."""
+    links = links or extract_page_links(html, url)
+    save_page_outlinks(url, links.internal_links, links.next_url or "")
+    if page is not None:
+        _queue_page_documents(links, category, pipeline, page)
+    else:
+        with pipeline.page(url) as page:
+            _queue_page_documents(links, category, pipeline, page)
+    return links
+
+
+def _link_digest(links: PageLinks) -> str:
+    """Order-independent digest of a listing page's document and detail links."""
+    keys = {canonicalize_url(doc_url) for doc_url, _ in links.doc_links}
+    keys.update(canonicalize_url(detail_url) for detail_url in links.detail_links)
+    return hashlib.sha256("\n".join(sorted(keys)).encode()).hexdigest()
+
+
+def _only_known_links(links: PageLinks) -> bool:
+    """True when every document is downloaded and every detail page resolved."""
+    return (
+        all(is_already_downloaded(doc_url) for doc_url, _ in links.doc_links)
+        and all(get_detail_attachments(detail_url) is not None for detail_url in links.detail_links)
+    )
+
+
+def _content_length(resp: requests.Response) -> int | None:
+    value = resp.headers.get("Content-Length", "")
+    return int(value) if value.isdigit() else None
+
+
+def revalidate_document(url: str, filename: str, category: str, file_hash: str,
+                        etag: str | None, last_modified: str | None,
+                        content_length: int | None) -> bool:
+    """Check a downloaded document with a conditional GET (headers only; the
+    body is not read). Re-downloads it if ETag, Last-Modified or size changed.
+    Returns True if the document changed. A failed check is stamped like a
+    successful one, so the oldest-first queue moves on to other documents."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    resp = fetch_with_retry(url, stream=True, headers=headers, phase="revalidate")
+    if resp is None:
+        count_stat("revalidations_failed")
+        mark_validated(url, None, None, None)
+        return False
+    try:
+        new_etag, new_lm = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        new_length = _content_length(resp)
+        if resp.status_code == 304:
+            changed = False
+        else:
+            if content_length is None and file_hash and _blob_path(file_hash).exists():
+                content_length = _blob_path(file_hash).stat().st_size
+            changed = (
+                bool(etag and new_etag and new_etag != etag)
+                or bool(last_modified and new_lm and new_lm != last_modified)
+                or bool(content_length and new_length and new_length != content_length)
+            )
+    finally:
+        close_response(resp)
+    count_stat("documents_revalidated")
+
+    if not changed:
+        mark_validated(url, new_etag, new_lm, new_length if resp.status_code != 304 else None)
+        return False
+    logger.info("Changed upstream, re-downloading: %s", url)
+    count_stat("documents_changed")
+    ext = Path(filename).suffix.lower()
+    download_document(url, ext, (category or "misc").rsplit("_", 1)[0], force=True)
+    return True
+
+
+def revalidate_documents(limit: int = REVALIDATE_PER_RUN) -> int:
+    """Revalidate this run's share of downloaded documents. Returns how many changed."""
+    due = get_documents_due(limit)
+    if not due:
+        return 0
+    logger.info("Revalidating %d downloaded documents", len(due))
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="irdai-reval") as pool:
+        changed = sum(pool.map(lambda row: revalidate_document(*row), due))
+    logger.info("Revalidation: %d of %d documents changed", changed, len(due))
+    return changed
+
+
+def _doc_ext(url: str) -> str:
+    """Document extension of a URL, matched the way extract_page_links does."""
+    lower = url.lower()
+    return next((ext for ext in DOC_TYPES if ext in lower), ".pdf")
+
+
+def get_deferred_downloads() -> list[tuple[str, str, str]]:
+    """(url, ext, category) of documents an earlier run's budget cut off."""
+    return [(url, _doc_ext(url), category) for url, category, _ in frontier_pending("download")]
+
+
+def get_incomplete_downloads() -> list[tuple[str, str, str]]:
+    """Documents an earlier run rejected as invalid content, left partial or
+    deferred when its budget ran out."""
+    return get_invalid_downloads() + get_partial_downloads() + get_deferred_downloads()
+
+
+def retry_incomplete_downloads() -> dict:
+    """Download again (resuming where possible) what earlier runs did not finish."""
+    incomplete = [row for row in get_incomplete_downloads() if _in_shard(row[0])]
+    if not incomplete:
+        return {"pdf": 0, "excel": 0, "word": 0}
+    logger.info("Retrying %d rejected, interrupted or deferred downloads", len(incomplete))
+    with DownloadPipeline() as pipeline:
+        for url, ext, category in incomplete:
+            # A deferred row is requeued by the pipeline if the budget runs out again
+            frontier_mark("download", url, "done")
+            pipeline.submit(url, ext, category)
+    return pipeline.counts
+
+
+def _skip_pagination(category: str, chain_pages: int, reason: str):
+    """Count the rest of a category's last complete pagination chain as skipped."""
+    skipped = max(0, chain_pages - 1)
+    count_stat(f"listing_pages_skipped_{category}", skipped)
+    logger.info("%s page 1 %s – skipping %d more listing pages", category, reason, skipped)
+
+
+def _advance_listing(category: str, url: str, next_url: str, next_page: int):
+    """Checkpoint a category's pagination in the frontier: the next page's row
+    is in_progress (so a killed run resumes there) and this page's is done."""
+    frontier_add("category", [(next_url, category)], depth=next_page)
+    frontier_mark("category", next_url, "in_progress")
+    frontier_mark("category", url, "done")
+
+
+def crawl_category(category: str, path: str, max_pages: int = 20,
+                   start_url: str | None = None, start_page: int = 1) -> dict:
+    """Crawl a single IRDAI category. Returns counts by doc type.
+    Pages are parsed here while a DownloadPipeline fetches their documents.
+    The "category" frontier row follows the pagination page by page and is
+    marked done once the listing ends. If the process dies, or the run's
+    budget runs out, the listing continues next run from the page it
+    reached (start_url/start_page).
+
+    A walk from page 1 that reaches the last page with every document
+    downloaded or skipped records the chain as complete. Only while it is,
+    an unchanged page 1 – or one that lists only known documents with the
+    same link digest as last run – ends the walk: older pages cannot hold
+    anything new. The pages skipped are counted as
+    listing_pages_skipped_<category>. The record expires after
+    PAGE_CACHE_MAX_AGE_HOURS, forcing a full walk. Otherwise the walk goes on
+    past unchanged pages by their stored Next link, so documents missed on
+    later pages are retried."""
+    first_url = BASE_URL + path
+    url = start_url or first_url
+    # Forgotten while this walk runs; recorded again only if it completes
+    chain_pages = get_chain_pages(first_url) if start_page == 1 else None
+    save_chain_pages(first_url, None, stamp=False)
+    walked, walked_to_end = None, False
+
+    with DownloadPipeline() as pipeline:
+        for page_num in range(start_page, max_pages + 1):
+            if budget_exhausted():
+                frontier_add("category", [(url, category)], depth=page_num)
+                frontier_mark("category", url, "pending")
+                break
+            logger.info("Crawling %s – page %d: %s", category, page_num, url)
+            html = fetch_page(url, phase="category", hold=True)
+            unchanged = html == ""
+            if unchanged and chain_pages:
+                if page_num == 1:
+                    _skip_pagination(category, chain_pages, "unchanged")
+                frontier_mark("category", url, "done")
+                walked = chain_pages
+                break
+            if unchanged:
+                # Its documents are complete; only the Next link is needed
+                next_url = _unchanged_page_next_url(url, "category")
+            elif html is not None:
+                links = extract_page_links(html, url)
+                next_url = links.next_url
+            if html is None or (unchanged and next_url is None):
+                # A run cut short (host down) retries the page next time
+                state = "pending" if budget_exhausted() else "failed"
+                frontier_mark("category", url, state, "fetch failed")
+                break
+
+            if not unchanged:
+                digest = _link_digest(links)
+                previous_digest = swap_link_digest(url, digest)
+                same_links = (
+                    chain_pages and page_num == 1
+                    and previous_digest == digest and _only_known_links(links)
+                )
+                _crawl_page_html(url, html, category, pipeline, links)
+                logger.info(
+                    "Found %d document links and %d document-detail links on page %d",
+                    len(links.doc_links), len(links.detail_links), page_num,
+                )
+                if same_links:
+                    _skip_pagination(category, chain_pages, "lists no new documents")
+                    frontier_mark("category", url, "done")
+                    walked = chain_pages
+                    break
+
+            if not next_url or next_url == url or page_num == max_pages:
+                logger.info("No more pages for %s", category)
+                if start_page == 1:
+                    walked, walked_to_end = page_num, True
+                frontier_mark("category", url, "done")
+                break
+            _advance_listing(category, url, next_url, page_num + 1)
+            url = next_url
 
-    return counts
+    if walked and not pipeline.incomplete_pages:
+        save_chain_pages(first_url, walked, stamp=walked_to_end)
+    return pipeline.counts
 
 
 def _classify(ext: str) -> str:
@@ -474,155 +2661,551 @@ def _classify(ext: str) -> str:
     return "word"
 
 
-def _discover_all_internal_links(html: str, base_url: str) -> list[str]:
-    """Find all internal /path links on a page for deep crawling."""
-    soup = BeautifulSoup(html, "html.parser")
-    links = set()
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
-        if href.startswith("javascript") or href.startswith("#") or href.startswith("mailto"):
-            continue
-        if href.startswith("/") or "irdai.gov.in" in href:
-            full = urljoin(base_url, href)
-            links.add(full)
-    return list(links)
+def _category_for(path: str, default: str) -> str:
+    """Derive a sanitized category folder name from a site path."""
+    category = path.strip("/").split("/")[-1] or default
+    return category.replace("?", "_").replace("&", "_")[:50]
+
+
+def _is_irdai_host(url: str) -> bool:
+    """True for irdai.gov.in itself (external subdomains are skipped)."""
+    return urlparse(url).hostname in ("irdai.gov.in", "www.irdai.gov.in")
+
+
+def _is_crawlable_page(url: str) -> bool:
+    """Internal HTML page worth a frontier slot (documents, detail pages and
+    login/action URLs are handled elsewhere or skipped)."""
+    lower = url.lower()
+    return (
+        _is_irdai_host(url)
+        and not any(ext in lower for ext in DOC_TYPES)
+        and not any(marker in lower for marker in _SKIP_LINK_MARKERS)
+    )
+
+
+def _unchanged_page_outlinks(url: str, phase: str = "page") -> list[str]:
+    """Internal links of a page that has not changed since the last run, or
+    that another phase already fetched this run under any URL spelling."""
+    outlinks = get_page_outlinks(url)
+    if outlinks is None and _visited_pages.fetched_as(url) != url:
+        outlinks = get_page_outlinks(_visited_pages.fetched_as(url))
+    if outlinks is None:
+        # Cached before outlinks were stored: fetch once for its links only
+        html = fetch_page(url, conditional=False, phase=phase)
+        links = extract_page_links(html, url) if html else _NO_LINKS
+        outlinks = links.internal_links
+        save_page_outlinks(url, outlinks, links.next_url or "" if html else None)
+    return outlinks
+
+
+def _unchanged_page_next_url(url: str, phase: str = "page") -> str | None:
+    """Next link of a listing page that has not changed since the last run
+    ("" on the last page), or None if it cannot be had."""
+    next_url = get_page_next_url(url)
+    if next_url is None:
+        # Cached before Next links were stored: fetch once for its links only
+        html = fetch_page(url, conditional=False, phase=phase)
+        if html is None:
+            return None
+        links = extract_page_links(html, url)
+        next_url = links.next_url or ""
+        save_page_outlinks(url, links.internal_links, next_url)
+    return next_url
+
+
+def _queue_children(phase: str, links: list[str], depth: int):
+    """Add a page's crawlable internal links to the frontier one level deeper."""
+    frontier_add(phase, [
+        (link, _category_for(urlparse(link).path or "/", "misc"))
+        for link in links if _is_crawlable_page(link)
+    ], depth=depth)
 
 
 def crawl_extra_pages() -> dict:
-    """Crawl ALL IRDAI sections (home, forms, reports, departments, lists, etc.)."""
-    counts = {"pdf": 0, "excel": 0, "word": 0}
-    visited_pages = set()
+    """Crawl ALL IRDAI sections (home, forms, reports, departments, lists, etc.).
+    Progress is kept in the persistent frontier, so an interrupted run resumes."""
+    frontier_add("extra", [(BASE_URL + path, _category_for(path, "home")) for path in EXTRA_PAGES])
+    frontier_resume("extra")
+
+    with DownloadPipeline() as pipeline:
+        while (entry := frontier_next("extra")):
+            url, category, _depth = entry
+            if budget_exhausted():
+                frontier_mark("extra", url, "pending")
+                break
+            logger.info("Crawling extra page: %s [%s]", url, category)
+            html = fetch_page(url, phase="extra", hold=True)
+            if html is None:
+                # A run cut short (host down) retries the page next time
+                state = "pending" if budget_exhausted() else "failed"
+                frontier_mark("extra", url, state, "fetch failed")
+                continue
+            if not html:
+                frontier_mark("extra", url, "done")
+                continue
 
-    for path in EXTRA_PAGES:
-        url = BASE_URL + path
-        if url in visited_pages:
-            continue
-        visited_pages.add(url)
-
-        category = path.strip("/").split("/")[-1] or "home"
-        # Sanitize category name
-        category = category.replace("?", "_").replace("&", "_")[:50]
-        logger.info("Crawling extra page: %s [%s]", url, category)
-        resp = fetch_with_retry(url)
-        if not resp:
-            continue
+            links = _crawl_page_html(url, html, category, pipeline)
+            logger.info("Found %d document links on %s", len(links.doc_links), category)
+            frontier_mark("extra", url, "done")
+
+    return pipeline.counts
 
-        doc_links = extract_doc_links(resp.text, url)
-        logger.info("Found %d document links on %s", len(doc_links), category)
 
-        for doc_url, ext in doc_links:
-            if download_document(doc_url, ext, category):
-                counts[_classify(ext)] += 1
-            time.sleep(0.3)
+def deep_discover_and_crawl(max_depth: int = DEEP_MAX_DEPTH, max_pages: int = DEEP_MAX_PAGES,
+                            max_seconds: float = DEEP_MAX_SECONDS) -> dict:
+    """Breadth-first crawl of the whole site from the IRDAI homepage.
 
-        # Follow document-detail pages
-        detail_links = extract_document_detail_links(resp.text, url)
-        for detail_url in detail_links:
-            if detail_url in visited_pages:
+    Pages come off the persistent frontier best-first (shallow pages and
+    regulatory sections first, see _priority_score). Their documents are
+    downloaded and their internal links queued one level deeper, until
+    max_depth, max_pages or max_seconds is reached. Unchanged pages are
+    expanded from their stored outlinks. An interrupted run resumes.
+    """
+    home = BASE_URL + "/home"
+    frontier_add("deep", [(home, "home")])
+    frontier_resume("deep")
+    deadline = time.monotonic() + max_seconds
+    crawled = 0
+
+    with DownloadPipeline() as pipeline:
+        while (entry := frontier_wait_next("deep", deadline)):
+            url, category, depth = entry
+            if crawled >= max_pages or time.monotonic() >= deadline or budget_exhausted():
+                frontier_mark("deep", url, "pending")
+                logger.info("Deep crawl budget reached after %d pages", crawled)
+                break
+            crawled += 1
+
+            logger.info("Deep crawl [%d, depth %d]: %s", crawled, depth, url[:100])
+            html = fetch_page(url, phase="deep", hold=True)
+            if html is None:
+                # A run cut short (host down) retries the page next time
+                state = "pending" if budget_exhausted() else "failed"
+                frontier_mark("deep", url, state, "fetch failed")
                 continue
-            visited_pages.add(detail_url)
-            try:
-                detail_resp = fetch_with_retry(detail_url)
-                if detail_resp:
-                    inner_docs = extract_doc_links(detail_resp.text, detail_url)
-                    for doc_url, ext in inner_docs:
-                        if download_document(doc_url, ext, category):
-                            counts[_classify(ext)] += 1
-                        time.sleep(0.3)
-            except Exception as exc:
-                logger.warning("Error on detail page %s: %s", detail_url[:80], exc)
-            time.sleep(0.3)
-
-        time.sleep(0.5)
-    return counts
-
-
-def deep_discover_and_crawl() -> dict:
-    """Discover all pages from IRDAI homepage, follow every internal link
-    and download documents found anywhere on the site."""
-    counts = {"pdf": 0, "excel": 0, "word": 0}
-    visited = set()
-    to_visit = [BASE_URL + "/home"]
-
-    # Phase 1: Discover all pages from homepage
-    logger.info("Phase 1: Discovering all internal links from homepage…")
-    resp = fetch_with_retry(BASE_URL + "/home")
-    if resp:
-        found = _discover_all_internal_links(resp.text, BASE_URL + "/home")
-        for link in found:
-            if link not in to_visit:
-                to_visit.append(link)
-    logger.info("Discovered %d internal links to crawl", len(to_visit))
-
-    # Phase 2: Visit each page and download documents
-    for idx, url in enumerate(to_visit):
-        if url in visited:
-            continue
-        # Skip non-irdai.gov.in links
-        if "irdai.gov.in" not in url:
-            continue
-        # Skip external subdomains (bimabharosa, agencyportal, etc.)
-        parsed = urlparse(url)
-        if parsed.hostname and parsed.hostname != "irdai.gov.in" and parsed.hostname != "www.irdai.gov.in":
-            continue
+            if html:
+                # Download any docs found directly or on document-detail pages
+                outlinks = _crawl_page_html(url, html, category, pipeline).internal_links
+            else:
+                outlinks = _unchanged_page_outlinks(url, "deep")
+
+            if depth < max_depth:
+                _queue_children("deep", outlinks, depth + 1)
+            frontier_mark("deep", url, "done")
+    frontier_shard_done("deep")
+
+    logger.info("Deep crawl complete. Crawled %d pages. Docs: %s", crawled, pipeline.counts)
+    return pipeline.counts
+
+
+# ─── Feed Discovery ────────────────────────────────────────────────────────────
+_FEED_PARSER = lxml.etree.XMLParser(
+    encoding="utf-8", resolve_entities=False, no_network=True, recover=True
+)
+
+
+def _local_name(elem) -> str | None:
+    """Tag without its XML namespace (None for comments/processing instructions)."""
+    return lxml.etree.QName(elem).localname if isinstance(elem.tag, str) else None
+
+
+def _child_text(elem, *names: str) -> str | None:
+    """Stripped text of the first child named any of `names`, in that order."""
+    found = {_local_name(child): child for child in reversed(elem)}
+    for name in names:
+        if name in found and (found[name].text or "").strip():
+            return found[name].text.strip()
+    return None
+
+
+def parse_feed(xml: str) -> tuple[list[tuple[str, str | None]], list[str]]:
+    """Entries of a sitemap, sitemap index, RSS or Atom document.
+
+    Returns ([(url, timestamp)], child_sitemaps). Timestamps are the feed's
+    own strings (lastmod / pubDate / updated), or None when absent; RSS
+    enclosures and Atom enclosure links are entries of their own.
+    """
+    try:
+        root = lxml.etree.fromstring(xml.encode("utf-8"), _FEED_PARSER)
+    except lxml.etree.XMLSyntaxError:
+        return [], []
+    if root is None:
+        return [], []
+
+    entries, sitemaps = [], []
+    for elem in root.iter():
+        name = _local_name(elem)
+        if name == "sitemap" and (loc := _child_text(elem, "loc")):
+            sitemaps.append(loc)
+        elif name == "url" and (loc := _child_text(elem, "loc")):
+            entries.append((loc, _child_text(elem, "lastmod")))
+        elif name == "item":
+            stamp = _child_text(elem, "pubDate", "date", "updated")
+            links = [_child_text(elem, "link")]
+            links += [child.get("url") for child in elem if _local_name(child) == "enclosure"]
+            entries.extend((link, stamp) for link in links if link)
+        elif name == "entry":
+            stamp = _child_text(elem, "updated", "published")
+            entries.extend(
+                (child.get("href"), stamp) for child in elem
+                if _local_name(child) == "link" and child.get("href")
+                and child.get("rel", "alternate") in ("alternate", "enclosure")
+            )
+    return entries, sitemaps
 
-        visited.add(url)
-        path = parsed.path or "/"
-        category = path.strip("/").split("/")[-1] or "misc"
-        category = category.replace("?", "_").replace("&", "_")[:50]
 
-        logger.info("Deep crawl [%d/%d]: %s", idx + 1, len(to_visit), url[:100])
-        resp = fetch_with_retry(url)
-        if not resp:
+def _robots_sitemaps() -> list[str]:
+    """Sitemap URLs declared in the site's robots.txt."""
+    resp = fetch_with_retry(BASE_URL + "/robots.txt", phase="feed")
+    if not resp:
+        return []
+    return [
+        line.split(":", 1)[1].strip()
+        for line in resp.text.splitlines()
+        if line.lower().startswith("sitemap:") and line.split(":", 1)[1].strip()
+    ]
+
+
+def _feed_category(url: str) -> str:
+    """Category folder for a document found through a feed: the document
+    category its path mentions, else "whats_new"."""
+    path = urlparse(url).path.lower()
+    return next((cat for cat in DOCUMENT_CATEGORIES if cat.rstrip("s") in path), "whats_new")
+
+
+def _queue_feed_entry(url: str, changed: bool, pipeline: DownloadPipeline, entry: FeedEntryTicket):
+    """Send a new or changed feed URL straight to the download path: documents
+    are queued, detail and other pages are fetched once for their documents.
+    `entry` is told the outcome of each."""
+    lower = url.lower()
+    category = _feed_category(url)
+    ext = next((ext for ext in DOC_TYPES if ext in lower), None)
+    if ext:
+        pipeline.submit(url, ext, category, force=changed and is_already_downloaded(url), page=entry)
+    elif "document-detail" in url and "documentId" in url:
+        html = fetch_page(url, conditional=False, phase="feed")
+        if html is None:
+            entry.fail()
+        for doc_url, doc_ext in _detail_attachments_from_html(url, html) if html else []:
+            pipeline.submit(doc_url, doc_ext, category, page=entry)
+    elif (html := fetch_page(url, phase="feed", hold=True)):
+        _crawl_page_html(url, html, category, pipeline, page=entry)
+    elif html is None:
+        entry.fail()
+
+
+def discover_from_feeds(pipeline: DownloadPipeline, feeds: list[str] | None = None) -> int:
+    """Read sitemaps and RSS/Atom feeds (conditional GETs, so unchanged feeds
+    cost a 304) and queue the entries that are new or whose timestamp moved
+    since they were last seen. Returns the number of such entries.
+
+    The first time a feed is read its pages are only recorded – the full HTML
+    crawl already covers them – while its documents are still queued. A
+    queued entry is recorded once its documents are in, and the feed's
+    validators once all its entries are (see FeedEntryTicket), so an entry
+    that failed is queued again by the next run."""
+    pending = [urljoin(BASE_URL + "/", f) for f in (feeds if feeds is not None else FEED_URLS)]
+    pending += _robots_sitemaps()
+    read: set[str] = set()
+    fresh_total = 0
+    while pending:
+        feed = pending.pop(0)
+        if feed in read:
+            continue
+        read.add(feed)
+        body = fetch_page(feed, phase="feed", hold=True)
+        if body == "":
+            # Unchanged index: its child sitemaps may still have changed
+            pending.extend(get_feed_entries(feed, sitemaps=True))
+        if not body:
             continue
+        entries, sitemaps = parse_feed(body)
+        children = [urljoin(feed, child) for child in sitemaps]
+        save_feed_entries(feed, [(child, None) for child in children], sitemaps=True)
+        pending.extend(children)
+        known = get_feed_entries(feed)
+        fresh = [
+            (url, lastmod)
+            for url, lastmod in ((urljoin(feed, link), stamp) for link, stamp in entries)
+            if url not in known or (lastmod and lastmod != known[url])
+        ]
+        logger.info("Feed %s – %d entries, %d new or changed", feed, len(entries), len(fresh))
+        recorded = []
+        with pipeline.page(feed) as feed_page:
+            for url, lastmod in fresh:
+                lower = url.lower()
+                if not _is_irdai_host(url) or (not known and not any(ext in lower for ext in DOC_TYPES)):
+                    recorded.append((url, lastmod))
+                    continue
+                try:
+                    with FeedEntryTicket(url, pipeline, feed_page, lastmod) as entry:
+                        _queue_feed_entry(url, url in known, pipeline, entry)
+                except Exception as exc:
+                    logger.warning("Error following feed entry %s: %s", url[:80], exc)
+            save_feed_entries(feed, recorded)
+        fresh_total += len(fresh)
+    count_stat("feed_entries_new", fresh_total)
+    return fresh_total
+
+
+# ─── Async Crawl Engine ────────────────────────────────────────────────────────
+class AsyncCrawlEngine:
+    """Concurrent alternative to crawl_category / crawl_extra_pages /
+    deep_discover_and_crawl.
+
+    Keeps up to `max_in_flight` requests running at once, with at most
+    `per_host` of them against any single host. The blocking HTTP and disk
+    work (fetch_with_retry, download_document) runs on a thread pool; the
+    event loop only schedules it.
+    """
 
-        # Download any docs found directly
-        doc_links = extract_doc_links(resp.text, url)
-        for doc_url, ext in doc_links:
-            if download_document(doc_url, ext, category):
-                counts[_classify(ext)] += 1
-            time.sleep(0.3)
-
-        # Follow document-detail pages
-        detail_links = extract_document_detail_links(resp.text, url)
-        for detail_url in detail_links:
-            if detail_url in visited:
-                continue
-            visited.add(detail_url)
-            try:
-                detail_resp = fetch_with_retry(detail_url)
-                if detail_resp:
-                    inner = extract_doc_links(detail_resp.text, detail_url)
-                    for doc_url, ext in inner:
-                        if download_document(doc_url, ext, category):
-                            counts[_classify(ext)] += 1
-                        time.sleep(0.3)
-            except Exception as exc:
-                logger.warning("Detail error: %s", exc)
-            time.sleep(0.3)
-
-        time.sleep(0.3)
-
-    logger.info("Deep crawl complete. Visited %d pages. Docs: %s", len(visited), counts)
-    return counts
-
-
-def run_crawl(categories: list[str] | None = None) -> dict:
-    """Run crawler for all (or selected) categories + all extra sections + deep discovery. Returns summary."""
+    def __init__(self, max_in_flight: int = CRAWL_CONCURRENCY,
+                 per_host: int = PER_HOST_CONCURRENCY):
+        self.max_in_flight = max(1, max_in_flight)
+        self.per_host = max(1, per_host)
+        self.counts = {"pdf": 0, "excel": 0, "word": 0}
+        self.incomplete_pages: set[str] = set()
+        self._queued_docs: set[str] = set()
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._slots: asyncio.Semaphore | None = None
+        self._pool: ThreadPoolExecutor | None = None
+
+    async def _limited(self, url: str, func, *args):
+        """Run a blocking call for `url` once a global and a per-host slot are free."""
+        host = urlparse(url).hostname or ""
+        host_slot = self._host_slots.setdefault(host, asyncio.Semaphore(self.per_host))
+        # Take the host slot first so a busy host never hogs global slots
+        async with host_slot, self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, func, *args)
+
+    @staticmethod
+    async def _gather(tasks: list) -> list:
+        """Await tasks concurrently, logging (not raising) individual failures.
+        Returns the results, exceptions included."""
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Async crawl task failed: %s", result)
+        return results
+
+    async def _fetch_html(self, url: str, conditional: bool = True,
+                          phase: str = "page", hold: bool = False) -> str | None:
+        return await self._limited(url, fetch_page, url, conditional, phase, hold)
+
+    async def _download(self, doc_url: str, ext: str, category: str) -> bool:
+        """Download a document; True once it is downloaded or skipped."""
+        key = canonicalize_url(doc_url)
+        if key in self._queued_docs:
+            return True
+        self._queued_docs.add(key)
+        if await self._limited(doc_url, download_document, doc_url, ext, category):
+            self.counts[_classify(ext)] += 1
+        return await asyncio.to_thread(_document_settled, doc_url)
+
+    async def _crawl_detail(self, detail_url: str, category: str) -> bool:
+        attachments = await asyncio.to_thread(get_detail_attachments, detail_url)
+        if attachments is not None:
+            count_stat("detail_pages_memoized")
+        else:
+            html = await self._fetch_html(detail_url, False, "detail")
+            if html is None:
+                return False
+            attachments = await asyncio.to_thread(_detail_attachments_from_html, detail_url, html)
+        results = await self._gather([
+            self._download(doc_url, ext, category) for doc_url, ext in attachments
+        ])
+        return all(result is True for result in results)
+
+    async def _crawl_page(self, url: str, category: str, phase: str = "page") -> PageLinks | None:
+        """Download every document on a page and its detail pages. Returns the
+        page's links, _NO_LINKS if it is unchanged or None if the fetch failed.
+        The page's validators are saved only if none of its documents failed."""
+        html = await self._fetch_html(url, phase=phase, hold=True)
+        if html is None:
+            return None
+        if not html:
+            return _NO_LINKS
+        links = extract_page_links(html, url)
+        await asyncio.to_thread(save_page_outlinks, url, links.internal_links, links.next_url or "")
+        tasks = [self._download(doc_url, ext, category) for doc_url, ext in links.doc_links]
+        tasks += [self._crawl_detail(detail_url, category) for detail_url in links.detail_links]
+        complete = all(result is True for result in await self._gather(tasks))
+        if not complete:
+            self.incomplete_pages.add(url)
+        await asyncio.to_thread(release_page_validators, url, complete)
+        return links
+
+    async def _crawl_category(self, category: str, path: str, max_pages: int = 20):
+        """Walk a category's pagination. As in crawl_category, an unchanged
+        page ends the walk only while the chain is known to be complete."""
+        first_url = url = BASE_URL + path
+        chain_pages = await asyncio.to_thread(get_chain_pages, first_url)
+        await asyncio.to_thread(save_chain_pages, first_url, None, False)
+        walked, walked_to_end, pages = None, False, []
+        for page_num in range(1, max_pages + 1):
+            logger.info("Async crawling %s – page %d: %s", category, page_num, url)
+            pages.append(url)
+            links = await self._crawl_page(url, category, "category")
+            if links is _NO_LINKS and chain_pages:
+                walked = chain_pages
+                break
+            if links is None:
+                break
+            next_url = links.next_url
+            if links is _NO_LINKS:
+                next_url = await self._limited(url, _unchanged_page_next_url, url, "category")
+                if next_url is None:
+                    break
+            if not next_url or next_url == url or page_num == max_pages:
+                walked, walked_to_end = page_num, True
+                break
+            url = next_url
+        if walked and self.incomplete_pages.isdisjoint(pages):
+            await asyncio.to_thread(save_chain_pages, first_url, walked, walked_to_end)
+
+    async def _crawl_phase(self, phase: str, entries: list[tuple[str, str]], depth: int = 0):
+        """Queue (url, category) entries in the persistent frontier, then crawl
+        every pending row of the phase concurrently."""
+        await asyncio.to_thread(frontier_add, phase, entries, depth)
+        await asyncio.to_thread(frontier_resume, phase)
+        pending = await asyncio.to_thread(frontier_pending, phase)
+        await self._gather([
+            self._crawl_frontier_page(phase, url, category) for url, category, _depth in pending
+        ])
+
+    async def _crawl_frontier_page(self, phase: str, url: str, category: str,
+                                   depth: int = 0, max_depth: int = -1):
+        """Crawl one frontier row; below max_depth its internal links are queued
+        one level deeper (pages already crawled this run expand from stored outlinks)."""
+        await asyncio.to_thread(frontier_mark, phase, url, "in_progress")
+        links = await self._crawl_page(url, category, phase)
+        if links is None:
+            state = "pending" if budget_exhausted() else "failed"
+            await asyncio.to_thread(frontier_mark, phase, url, state, "fetch failed")
+            return
+        outlinks = links.internal_links
+        if links is _NO_LINKS and depth < max_depth:
+            outlinks = await asyncio.to_thread(_unchanged_page_outlinks, url, phase)
+        if depth < max_depth:
+            await asyncio.to_thread(_queue_children, phase, outlinks, depth + 1)
+        await asyncio.to_thread(frontier_mark, phase, url, "done")
+
+    async def _crawl_deep(self, max_depth: int = DEEP_MAX_DEPTH, max_pages: int = DEEP_MAX_PAGES,
+                          max_seconds: float = DEEP_MAX_SECONDS):
+        """Breadth-first deep crawl in waves: all pending frontier rows are
+        crawled concurrently, then the links they queued form the next wave."""
+        home = BASE_URL + "/home"
+        await asyncio.to_thread(frontier_add, "deep", [(home, "home")])
+        await asyncio.to_thread(frontier_resume, "deep")
+        deadline = time.monotonic() + max_seconds
+        crawled = 0
+        while crawled < max_pages and time.monotonic() < deadline and not budget_exhausted():
+            wave = await asyncio.to_thread(frontier_pending, "deep", max_pages - crawled)
+            if not wave:
+                break
+            crawled += len(wave)
+            logger.info("Async deep crawl wave: %d pages (%d so far)", len(wave), crawled)
+            await self._gather([
+                self._crawl_frontier_page("deep", url, category, depth, max_depth)
+                for url, category, depth in wave
+            ])
+
+    async def run(self, categories: list[str] | None = None) -> dict:
+        """Crawl categories and extra pages concurrently, then the deep crawl."""
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="irdai-crawl"
+        )
+        try:
+            incomplete = await asyncio.to_thread(get_incomplete_downloads)
+            tasks = [self._download(url, ext, category) for url, ext, category in incomplete]
+            for cat in categories or list(DOCUMENT_CATEGORIES.keys()):
+                path = DOCUMENT_CATEGORIES.get(cat)
+                if not path:
+                    logger.warning("Unknown category: %s", cat)
+                    continue
+                tasks.append(self._crawl_category(cat, path))
+            tasks.append(self._crawl_phase(
+                "extra", [(BASE_URL + path, _category_for(path, "home")) for path in EXTRA_PAGES]
+            ))
+            await self._gather(tasks)
+            # The deep crawl expands pages the other phases already crawled
+            # from their stored outlinks, so it starts once they are done
+            await self._gather([self._crawl_deep()])
+        finally:
+            self._pool.shutdown(wait=True)
+        logger.info("Async crawl visited %d pages. Docs: %s", len(_visited_pages), self.counts)
+        return self.counts
+
+
+def run_crawl_async(
+    categories: list[str] | None = None,
+    max_in_flight: int = CRAWL_CONCURRENCY,
+    per_host: int = PER_HOST_CONCURRENCY,
+    revalidate: bool = REVALIDATE_DOCUMENTS,
+) -> dict:
+    """Drop-in replacement for run_crawl using AsyncCrawlEngine. Returns the same
+    summary. Crawl budgets do not apply to this engine, but a run cut short by
+    a down host keeps its frontier like run_crawl."""
+    global _budget
+    _budget = CrawlBudget()
     init_db()
     for _d in [PDF_DIR, EXCEL_DIR, WORD_DIR]:
         _d.mkdir(parents=True, exist_ok=True)
 
+    load_seen_index()
+    load_dead_urls()
+    reset_run_stats()
+    _visited_pages.reset()
+    start_metrics_run()
+    started = time.monotonic()
+
+    engine = AsyncCrawlEngine(max_in_flight=max_in_flight, per_host=per_host)
+    try:
+        summary = asyncio.run(engine.run(categories))
+        if revalidate and not budget_exhausted():
+            revalidate_documents()
+    finally:
+        flush_downloads()
+        flush_request_metrics()
+    if not get_run_stats().get("budget_exhausted"):
+        frontier_clear()
+    summary["http"] = get_http_stats()
+    summary["stats"] = get_run_stats()
+    summary["timing"] = get_timing_summary(time.monotonic() - started)
+    logger.info("Async crawl complete. Summary: %s", summary)
+    return summary
+
+
+def _crawl_phases(categories: list[str] | None, before_deep=None,
+                  deep_max_pages: int = DEEP_MAX_PAGES) -> dict:
+    """Phases 0-3 of a crawl run; in a sharded run each worker calls this and
+    handles only the categories and pages of its shard. Returns doc counts."""
     cats = categories or list(DOCUMENT_CATEGORIES.keys())
     summary = {"pdf": 0, "excel": 0, "word": 0}
 
-    # Phase 1: Crawl main document categories with pagination
+    # Phase 0: Documents rejected (HTML error/login page) or interrupted last time
+    retry_counts = retry_incomplete_downloads()
+    for k in summary:
+        summary[k] += retry_counts.get(k, 0)
+
+    # Phase 1: Crawl main document categories with pagination, by priority
+    # (circulars/notifications first). A budget-cut listing continues from
+    # the page it stopped at; categories finished before stay done.
+    frontier_resume("category")
+    known = []
     for cat in cats:
         path = DOCUMENT_CATEGORIES.get(cat)
         if not path:
             logger.warning("Unknown category: %s", cat)
             continue
-        counts = crawl_category(cat, path)
+        known.append((BASE_URL + path, cat))
+    frontier_add("category", known, depth=1)
+    while not budget_exhausted() and (entry := frontier_next("category")):
+        url, cat, page_num = entry
+        # crawl_category moves the row along the pagination and marks it done
+        counts = crawl_category(cat, DOCUMENT_CATEGORIES[cat], start_url=url, start_page=page_num)
         for k in summary:
             summary[k] += counts.get(k, 0)
         logger.info("Category '%s' – %s", cat, counts)
@@ -634,15 +3217,160 @@ def run_crawl(categories: list[str] | None = None) -> dict:
     logger.info("Extra pages – %s", extra_counts)
 
     # Phase 3: Deep discovery - follow every internal link from homepage
-    deep_counts = deep_discover_and_crawl()
+    if before_deep:
+        before_deep()
+    deep_counts = deep_discover_and_crawl(max_pages=deep_max_pages)
     for k in summary:
         summary[k] += deep_counts.get(k, 0)
     logger.info("Deep discovery – %s", deep_counts)
+    return summary
+
 
+def _crawl_shard(index: int, workers: int, categories: list[str] | None, barrier,
+                 time_budget: float = 0, byte_budget: int = 0, run_id: str = "") -> dict:
+    """Worker process of a sharded crawl. Returns its doc counts plus raw
+    HTTP and run stats for the parent to merge."""
+    global _shard, _budget, _run_id
+    _shard = (index, workers)
+    _budget = CrawlBudget(time_budget, byte_budget)
+    _run_id = run_id
+    load_seen_index()
+    load_dead_urls()
+    reset_run_stats()
+    _visited_pages.reset()
+
+    def wait_for_all():
+        # Deep crawl workers queue links for each other, so all start it together
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            logger.warning("Shard barrier broken; starting the deep crawl anyway")
+
+    try:
+        counts = _crawl_phases(categories, wait_for_all, math.ceil(DEEP_MAX_PAGES / workers))
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        flush_downloads()
+        flush_request_metrics()
+    with _http_stats_lock:
+        http = dict(_http_stats)
+    return {"counts": counts, "http": http, "stats": dict(get_run_stats())}
+
+
+def _run_sharded(categories: list[str] | None, workers: int,
+                 time_budget: float = 0, byte_budget: int = 0) -> dict:
+    """Run _crawl_shard in `workers` processes; returns merged counts, with
+    the merged HTTP and run stats folded into this process's counters.
+    Each worker gets the whole time budget and an equal share of the bytes."""
+    clear_run_claims()
+    ctx = multiprocessing.get_context(SHARD_START_METHOD)
+    summary = {"pdf": 0, "excel": 0, "word": 0}
+    with ctx.Manager() as manager:
+        barrier = manager.Barrier(workers)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = [
+                pool.submit(_crawl_shard, i, workers, categories, barrier,
+                            time_budget, byte_budget // workers, _run_id)
+                for i in range(workers)
+            ]
+            results = [f.result() for f in futures]
+    for result in results:
+        for k in summary:
+            summary[k] += result["counts"].get(k, 0)
+        for key, n in result["http"].items():
+            _count_http(key, n)
+        for key, n in result["stats"].items():
+            count_stat(key, n)
+    clear_run_claims()
+    return summary
+
+
+def run_crawl(categories: list[str] | None = None,
+              revalidate: bool = REVALIDATE_DOCUMENTS, workers: int = CRAWL_WORKERS,
+              time_budget: float = CRAWL_TIME_BUDGET, byte_budget: int = CRAWL_BYTE_BUDGET) -> dict:
+    """Run crawler for all (or selected) categories + all extra sections + deep discovery.
+    With revalidate=True, also re-checks this run's share of known documents.
+
+    workers > 1 shards the crawl by URL hash over that many processes, which
+    coordinate through the tracker DB (shared frontier, page/document claims).
+
+    time_budget (seconds) and byte_budget (bytes downloaded) cap the run; 0
+    means unlimited. Once either is spent, the pages and documents not yet
+    fetched stay in the frontier and the next run starts with them.
+    Returns summary.
+    """
+    init_db()
+    for _d in [PDF_DIR, EXCEL_DIR, WORD_DIR]:
+        _d.mkdir(parents=True, exist_ok=True)
+
+    load_seen_index()
+    load_dead_urls()
+    reset_run_stats()
+    _visited_pages.reset()
+
+    global _budget
+    _budget = CrawlBudget(time_budget, byte_budget)
+    start_metrics_run()
+    started = time.monotonic()
+    if workers > 1:
+        summary = _run_sharded(categories, workers, time_budget, byte_budget)
+        load_seen_index()
+    else:
+        summary = _crawl_phases(categories)
+
+    # Phase 4: Conditional re-checks of already downloaded documents
+    if revalidate and not budget_exhausted():
+        revalidate_documents()
+
+    flush_downloads()
+    flush_request_metrics()
+    if get_run_stats().get("budget_exhausted"):
+        logger.info("Crawl budget spent – the remaining frontier is kept for the next run")
+    else:
+        # The run finished: the next one starts from a fresh frontier
+        frontier_clear()
+    summary["http"] = get_http_stats()
+    summary["stats"] = get_run_stats()
+    summary["timing"] = get_timing_summary(time.monotonic() - started)
     logger.info("Crawl complete. Summary: %s", summary)
     return summary
 
 
+def run_incremental_crawl(feeds: list[str] | None = None) -> dict:
+    """Cheap refresh between full crawls: only sitemaps/feeds are read and
+    their new or changed entries downloaded (see discover_from_feeds). The
+    frontier of an unfinished full crawl is left alone. Returns the same
+    summary as run_crawl, plus "feed_entries"."""
+    global _budget
+    init_db()
+    for _d in [PDF_DIR, EXCEL_DIR, WORD_DIR]:
+        _d.mkdir(parents=True, exist_ok=True)
+
+    load_seen_index()
+    load_dead_urls()
+    reset_run_stats()
+    _visited_pages.reset()
+    _budget = CrawlBudget()
+    start_metrics_run()
+    started = time.monotonic()
+
+    try:
+        with DownloadPipeline() as pipeline:
+            fresh = discover_from_feeds(pipeline, feeds)
+    finally:
+        flush_downloads()
+        flush_request_metrics()
+    summary = dict(pipeline.counts)
+    summary["feed_entries"] = fresh
+    summary["http"] = get_http_stats()
+    summary["stats"] = get_run_stats()
+    summary["timing"] = get_timing_summary(time.monotonic() - started)
+    logger.info("Incremental crawl complete. Summary: %s", summary)
+    return summary
+
+
 if __name__ == "__main__":
     result = run_crawl()
     print("Crawl summary:", result)
@@ -0,0 +1,107 @@
+"""
+IRDAI Compliance GPT - Text Extraction
+PDF / Excel / Word → per-page text.
+
+Kept apart from ingestion so extraction worker processes import only the
+file parsers, not chromadb or sentence-transformers/torch.
+"""
+
+import logging
+from pathlib import Path
+from typing import List
+
+import pdfplumber
+import openpyxl
+from docx import Document as DocxDocument
+
+logger = logging.getLogger("irdai.ingestion")
+
+
+# ─── Text Extraction ───────────────────────────────────────────────────────────
+def extract_text_from_pdf(pdf_path: Path) -> List[dict]:
+    """
+    Extract text from each page of a PDF.
+    Returns list of {"page": int, "text": str, "source": str}
+    """
+    pages = []
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            for i, page in enumerate(pdf.pages, start=1):
+                text = page.extract_text() or ""
+                text = text.strip()
+                if len(text) > 50:  # skip near-empty pages
+                    pages.append({
+                        "page":   i,
+                        "text":   text,
+                        "source": pdf_path.name,
+                    })
+    except Exception as exc:
+        logger.error("Failed to extract %s: %s", pdf_path.name, exc)
+    return pages
+
+
+def extract_text_from_excel(excel_path: Path) -> List[dict]:
+    """
+    Extract text from all sheets of an Excel file.
+    Each sheet becomes one 'page'. Cell values are joined into readable text.
+    """
+    pages = []
+    try:
+        wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+        for sheet_idx, sheet_name in enumerate(wb.sheetnames, start=1):
+            ws = wb[sheet_name]
+            rows_text = []
+            for row in ws.iter_rows(values_only=True):
+                cell_vals = [str(c).strip() for c in row if c is not None]
+                if cell_vals:
+                    rows_text.append(" | ".join(cell_vals))
+            text = "\n".join(rows_text).strip()
+            if len(text) > 50:
+                pages.append({
+                    "page":   sheet_idx,
+                    "text":   text,
+                    "source": excel_path.name,
+                })
+        wb.close()
+    except Exception as exc:
+        logger.error("Failed to extract %s: %s", excel_path.name, exc)
+    return pages
+
+
+def extract_text_from_word(word_path: Path) -> List[dict]:
+    """
+    Extract text from a Word (.docx) file.
+    All paragraphs are treated as page 1 (Word docs don't have page metadata).
+    """
+    pages = []
+    try:
+        doc = DocxDocument(str(word_path))
+        paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+        # Also extract text from tables
+        for table in doc.tables:
+            for row in table.rows:
+                cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+                if cells:
+                    paragraphs.append(" | ".join(cells))
+        text = "\n".join(paragraphs).strip()
+        if len(text) > 50:
+            pages.append({
+                "page":   1,
+                "text":   text,
+                "source": word_path.name,
+            })
+    except Exception as exc:
+        logger.error("Failed to extract %s: %s", word_path.name, exc)
+    return pages
+
+
+def extract_document_text(doc_path: Path) -> List[dict] | None:
+    """Pages of a PDF, Excel or Word file; None for unsupported types."""
+    ext = doc_path.suffix.lower()
+    if ext == ".pdf":
+        return extract_text_from_pdf(doc_path)
+    if ext in (".xlsx", ".xls"):
+        return extract_text_from_excel(doc_path)
+    if ext == ".docx":
+        return extract_text_from_word(doc_path)
+    return None
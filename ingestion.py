@@ -4,18 +4,24 @@ PDF / Excel / Word → Text Extraction → Chunking → Embedding → ChromaDB S
 """
 
 import os
+import hashlib
 import logging
+import threading
+import multiprocessing
 from pathlib import Path
 from typing import List
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 
 import chromadb
 from chromadb.config import Settings
-import pdfplumber
-import openpyxl
-from docx import Document as DocxDocument
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from sentence_transformers import SentenceTransformer
 
+from extraction import (
+    extract_text_from_pdf, extract_text_from_excel, extract_text_from_word, extract_document_text,
+)
+
 logger = logging.getLogger("irdai.ingestion")
 
 # ─── Config ────────────────────────────────────────────────────────────────────
@@ -31,83 +37,79 @@ CHUNK_SIZE     = 800
 CHUNK_OVERLAP  = 100
 COLLECTION_NAME = "irdai_docs"
 
+# Text extraction (pdfplumber is pure Python and CPU-bound) runs in this many
+# processes: the CPUs this process may use (not the host's count), at most
+# INGEST_WORKERS_MAX; 1 extracts in the main process
+INGEST_WORKERS_MAX = 4
+_CPUS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+INGEST_WORKERS = int(os.getenv("IRDAI_INGEST_WORKERS", str(min(_CPUS, INGEST_WORKERS_MAX))))
+# Workers start from a fresh interpreter: forking the app process (scheduler
+# and ingest worker threads, a loaded torch model) can deadlock the child.
+# They run extraction.extract_document_text, so they import only the parsers
+INGEST_START_METHOD = os.getenv(
+    "IRDAI_INGEST_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn",
+)
+
+# run_ingestion embeds chunks of many documents together, this many per
+# model.encode call (small circulars alone would leave batches mostly empty)
+EMBED_BATCH_SIZE = int(os.getenv("IRDAI_EMBED_BATCH_SIZE", "256"))
+
+# Streaming ingestion: how often an idle worker polls the crawler's queue
+INGEST_POLL_SECONDS = float(os.getenv("IRDAI_INGEST_POLL_SECONDS", "2"))
+
 
 # ─── Text Extraction ───────────────────────────────────────────────────────────
-def extract_text_from_pdf(pdf_path: Path) -> List[dict]:
-    """
-    Extract text from each page of a PDF.
-    Returns list of {"page": int, "text": str, "source": str}
-    """
-    pages = []
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages, start=1):
-                text = page.extract_text() or ""
-                text = text.strip()
-                if len(text) > 50:  # skip near-empty pages
-                    pages.append({
-                        "page":   i,
-                        "text":   text,
-                        "source": pdf_path.name,
-                    })
-    except Exception as exc:
-        logger.error("Failed to extract %s: %s", pdf_path.name, exc)
-    return pages
-
-
-def extract_text_from_excel(excel_path: Path) -> List[dict]:
-    """
-    Extract text from all sheets of an Excel file.
-    Each sheet becomes one 'page'. Cell values are joined into readable text.
-    """
-    pages = []
-    try:
-        wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
-        for sheet_idx, sheet_name in enumerate(wb.sheetnames, start=1):
-            ws = wb[sheet_name]
-            rows_text = []
-            for row in ws.iter_rows(values_only=True):
-                cell_vals = [str(c).strip() for c in row if c is not None]
-                if cell_vals:
-                    rows_text.append(" | ".join(cell_vals))
-            text = "\n".join(rows_text).strip()
-            if len(text) > 50:
-                pages.append({
-                    "page":   sheet_idx,
-                    "text":   text,
-                    "source": excel_path.name,
-                })
-        wb.close()
-    except Exception as exc:
-        logger.error("Failed to extract %s: %s", excel_path.name, exc)
-    return pages
-
-
-def extract_text_from_word(word_path: Path) -> List[dict]:
-    """
-    Extract text from a Word (.docx) file.
-    All paragraphs are treated as page 1 (Word docs don't have page metadata).
-    """
-    pages = []
-    try:
-        doc = DocxDocument(str(word_path))
-        paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-        # Also extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
-                if cells:
-                    paragraphs.append(" | ".join(cells))
-        text = "\n".join(paragraphs).strip()
-        if len(text) > 50:
-            pages.append({
-                "page":   1,
-                "text":   text,
-                "source": word_path.name,
-            })
-    except Exception as exc:
-        logger.error("Failed to extract %s: %s", word_path.name, exc)
-    return pages
+def extract_documents(items: list[tuple], workers: int = INGEST_WORKERS):
+    """Extract the files of (path, …) tuples and yield (path, …, pages) as
+    each finishes – in a pool of `workers` processes, or inline for 1. At
+    most 2 × workers files are in flight, so pages are consumed as they
+    stream in. If a worker dies, the files it took down are skipped and the
+    ones not yet submitted are extracted inline."""
+    todo = iter(items)
+    if workers > 1 and len(items) > 1:
+        leftovers: list[tuple] = []
+        ctx = multiprocessing.get_context(INGEST_START_METHOD)
+        if INGEST_START_METHOD == "forkserver":
+            # The server preloads the parsers instead of the default __main__
+            ctx.set_forkserver_preload(["extraction"])
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            pending: dict = {}
+
+            def submit_next():
+                item = next(todo, None)
+                if item is None:
+                    return
+                if leftovers:
+                    leftovers.append(item)
+                    return
+                try:
+                    pending[pool.submit(extract_document_text, item[0])] = item
+                except BrokenProcessPool:
+                    leftovers.append(item)
+
+            for _ in range(2 * workers):
+                submit_next()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    submit_next()
+                    try:
+                        pages = future.result()
+                    except BrokenProcessPool:
+                        # Not ingested, so the next run picks the file up again
+                        logger.error("Extraction worker died – %s left for the next run", item[0].name)
+                        continue
+                    except Exception as exc:
+                        logger.error("Failed to extract %s: %s", item[0].name, exc)
+                        pages = []
+                    yield (*item, pages)
+        if leftovers:
+            logger.warning("Extraction pool failed – extracting %d files inline", len(leftovers))
+        todo = iter(leftovers + list(todo))
+    for item in todo:
+        yield (*item, extract_document_text(item[0]))
 
 
 # ─── Chunking ──────────────────────────────────────────────────────────────────
@@ -159,35 +161,55 @@ def get_chroma_collection() -> chromadb.Collection:
     )
 
 
-def ingest_document(doc_path: Path, collection: chromadb.Collection, model: SentenceTransformer):
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's content (same digest the crawler stores as file_hash)."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def ingest_document(doc_path: Path, collection: chromadb.Collection, model: SentenceTransformer,
+                    file_hash: str | None = None):
     """Full pipeline for one document: extract → chunk → embed → upsert."""
+    return store_document_pages(doc_path, extract_document_text(doc_path),
+                                collection, model, file_hash)
+
+
+def prepare_chunks(doc_path: Path, pages: List[dict] | None,
+                   file_hash: str | None = None) -> tuple[list, list, list] | None:
+    """Chunk the extracted pages of one document into (ids, texts, metadatas);
+    None when there is nothing to embed."""
     logger.info("Ingesting: %s", doc_path.name)
     ext = doc_path.suffix.lower()
-
-    if ext == ".pdf":
-        pages = extract_text_from_pdf(doc_path)
-    elif ext in (".xlsx", ".xls"):
-        pages = extract_text_from_excel(doc_path)
-    elif ext == ".docx":
-        pages = extract_text_from_word(doc_path)
-    else:
+    if pages is None:
         logger.warning("Unsupported file type: %s", ext)
-        return 0
+        return None
 
     if not pages:
         logger.warning("No text extracted from %s", doc_path.name)
-        return 0
+        return None
 
     chunks = chunk_pages(pages)
     if not chunks:
-        return 0
-
-    texts = [c["text"] for c in chunks]
-    embeddings = model.encode(texts, batch_size=32, show_progress_bar=False).tolist()
+        return None
 
+    texts     = [c["text"] for c in chunks]
     ids       = [f"{doc_path.stem}_p{c['page']}_c{c['chunk']}" for c in chunks]
     metadatas = [{"source": c["source"], "page": c["page"], "type": ext}  for c in chunks]
-
+    if file_hash:
+        # file_mtime lets run_ingestion spot a replaced file with a cheap stat()
+        mtime = int(doc_path.stat().st_mtime)
+        for meta in metadatas:
+            meta["file_hash"] = file_hash
+            meta["file_mtime"] = mtime
+    return ids, texts, metadatas
+
+
+def upsert_chunks(doc_path: Path, collection: chromadb.Collection, ids: list, texts: list,
+                  metadatas: list, embeddings: list) -> int:
+    """Write one document's embedded chunks."""
     # Upsert in batches of 100
     batch = 100
     for i in range(0, len(ids), batch):
@@ -198,26 +220,114 @@ def ingest_document(doc_path: Path, collection: chromadb.Collection, model: Sent
             metadatas  = metadatas[i:i+batch],
         )
 
-    logger.info("Ingested %d chunks from %s", len(chunks), doc_path.name)
-    return len(chunks)
+    logger.info("Ingested %d chunks from %s", len(ids), doc_path.name)
+    return len(ids)
+
+
+def store_document_pages(doc_path: Path, pages: List[dict] | None, collection: chromadb.Collection,
+                         model: SentenceTransformer, file_hash: str | None = None) -> int:
+    """Chunk → embed → upsert the extracted pages of one document."""
+    prepared = prepare_chunks(doc_path, pages, file_hash)
+    if not prepared:
+        return 0
+    ids, texts, metadatas = prepared
+    embeddings = model.encode(texts, batch_size=32, show_progress_bar=False).tolist()
+    return upsert_chunks(doc_path, collection, ids, texts, metadatas, embeddings)
+
 
+class ChunkAccumulator:
+    """Embeds the chunks of many documents in fixed-size batches.
+
+    add() queues a document's chunks; every time `batch_size` chunks are
+    waiting they are encoded in one model.encode call, whatever documents
+    they came from. The embeddings are scattered back to their documents,
+    and each document is upserted on its own once all of its chunks are
+    embedded. add() and flush() return the (doc_path, tag, chunks) of the
+    documents upserted during the call.
+    """
 
-def run_ingestion(category: str | None = None) -> dict:
+    def __init__(self, collection: chromadb.Collection, model: SentenceTransformer,
+                 batch_size: int = EMBED_BATCH_SIZE):
+        self.collection = collection
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self._docs: list[dict] = []                 # documents not yet upserted, in order
+        self._waiting: list[tuple[dict, int]] = []  # (document, chunk index) to embed
+
+    def add(self, doc_path: Path, pages: List[dict] | None, file_hash: str | None = None,
+            tag=None) -> list[tuple[Path, object, int]]:
+        prepared = prepare_chunks(doc_path, pages, file_hash)
+        if not prepared:
+            return []
+        ids, texts, metadatas = prepared
+        doc = {"path": doc_path, "tag": tag, "ids": ids, "texts": texts,
+               "metadatas": metadatas, "embeddings": [None] * len(ids), "left": len(ids)}
+        self._docs.append(doc)
+        self._waiting.extend((doc, i) for i in range(len(ids)))
+        done = []
+        while len(self._waiting) >= self.batch_size:
+            done += self._embed(self.batch_size)
+        return done
+
+    def flush(self) -> list[tuple[Path, object, int]]:
+        """Embed whatever is left (one short batch) and upsert it."""
+        done = []
+        while self._waiting:
+            done += self._embed(self.batch_size)
+        return done
+
+    def _embed(self, count: int) -> list[tuple[Path, object, int]]:
+        batch, self._waiting = self._waiting[:count], self._waiting[count:]
+        vectors = self.model.encode(
+            [doc["texts"][i] for doc, i in batch],
+            batch_size=self.batch_size, show_progress_bar=False,
+        ).tolist()
+        for (doc, i), vector in zip(batch, vectors):
+            doc["embeddings"][i] = vector
+            doc["left"] -= 1
+
+        done = []
+        for doc in [d for d in self._docs if d["left"] == 0]:
+            self._docs.remove(doc)
+            chunks = upsert_chunks(doc["path"], self.collection, doc["ids"], doc["texts"],
+                                   doc["metadatas"], doc["embeddings"])
+            done.append((doc["path"], doc["tag"], chunks))
+        return done
+
+
+# run_ingestion and the streaming worker never write to the collection at once
+_ingest_lock = threading.Lock()
+
+
+def run_ingestion(category: str | None = None, workers: int = INGEST_WORKERS,
+                  embed_batch_size: int = EMBED_BATCH_SIZE) -> dict:
     """
     Ingest all documents (PDF, Excel, Word) from their respective directories.
+    Text is extracted by `workers` processes and streamed to a single
+    embedding/upsert stage in this process, which encodes chunks from many
+    documents in batches of `embed_batch_size`.
     Returns summary {"total_files": int, "total_chunks": int, "pdf": int, "excel": int, "word": int}.
     """
     collection = get_chroma_collection()
     model      = get_embed_model()
 
-    # Already-ingested document IDs (paginated to avoid SQLite variable limit)
+    # Already-ingested document IDs and content hashes, plus the hash/mtime
+    # recorded on each document's first chunk (paginated to avoid SQLite
+    # variable limit)
     existing: set[str] = set()
+    existing_hashes: set[str] = set()
+    first_chunks: dict[str, dict] = {}
     total = collection.count()
     if total > 0:
         batch_size = 5000
         for offset in range(0, total, batch_size):
-            batch = collection.get(limit=batch_size, offset=offset)["ids"]
-            existing.update(batch)
+            batch = collection.get(limit=batch_size, offset=offset, include=["metadatas"])
+            existing.update(batch["ids"])
+            for chunk_id, meta in zip(batch["ids"], batch["metadatas"]):
+                if meta and meta.get("file_hash"):
+                    existing_hashes.add(meta["file_hash"])
+                    if chunk_id.endswith("_p1_c0"):
+                        first_chunks[chunk_id] = meta
 
     # Collect files from all document directories
     doc_files: list[tuple[Path, str]] = []  # (path, type_label)
@@ -241,18 +351,46 @@ def run_ingestion(category: str | None = None) -> dict:
     total_files  = 0
     type_counts  = {"pdf": 0, "excel": 0, "word": 0}
 
+    to_ingest: list[tuple[Path, str, str]] = []
     for doc_path, doc_type in doc_files:
-        # Skip if first chunk ID already exists
+        # Skip if first chunk ID already exists, unless the crawler replaced
+        # the file since (revalidation found it changed upstream)
         first_id = f"{doc_path.stem}_p1_c0"
+        file_hash = None
         if first_id in existing:
-            logger.debug("Skipping already-ingested: %s", doc_path.name)
+            meta = first_chunks.get(first_id)
+            if not meta or meta.get("file_mtime") in (None, int(doc_path.stat().st_mtime)):
+                logger.debug("Skipping already-ingested: %s", doc_path.name)
+                continue
+            file_hash = file_sha256(doc_path)
+            if file_hash == meta["file_hash"]:
+                logger.debug("Skipping already-ingested: %s", doc_path.name)
+                continue
+            logger.info("Document changed, re-ingesting: %s", doc_path.name)
+            with _ingest_lock:
+                collection.delete(where={"source": doc_path.name})
+
+        # Same content saved under another name/category – never embed it twice
+        file_hash = file_hash or file_sha256(doc_path)
+        if file_hash in existing_hashes:
+            logger.debug("Skipping duplicate content: %s", doc_path.name)
             continue
-
-        chunks = ingest_document(doc_path, collection, model)
-        if chunks:
-            total_files  += 1
-            total_chunks += chunks
-            type_counts[doc_type] += 1
+        existing_hashes.add(file_hash)
+        to_ingest.append((doc_path, doc_type, file_hash))
+
+    # Chunks of consecutive documents share encode batches (ChunkAccumulator)
+    accumulator = ChunkAccumulator(collection, model, embed_batch_size)
+    stored: list[tuple[Path, str, int]] = []
+    for doc_path, doc_type, file_hash, pages in extract_documents(to_ingest, workers):
+        with _ingest_lock:
+            stored += accumulator.add(doc_path, pages, file_hash, doc_type)
+    with _ingest_lock:
+        stored += accumulator.flush()
+
+    for _path, doc_type, chunks in stored:
+        total_files  += 1
+        total_chunks += chunks
+        type_counts[doc_type] += 1
 
     summary = {
         "total_files":  total_files,
@@ -263,6 +401,74 @@ def run_ingestion(category: str | None = None) -> dict:
     return summary
 
 
+# ─── Streaming Ingestion ───────────────────────────────────────────────────────
+_DOC_TYPES = {".pdf": "pdf", ".xlsx": "excel", ".xls": "excel", ".docx": "word"}
+
+
+def ingest_ready_document(doc_path: Path, collection: chromadb.Collection,
+                          model: SentenceTransformer, file_hash: str | None = None) -> int:
+    """Ingest one freshly downloaded file, with targeted lookups instead of
+    run_ingestion's full scan: content already in the collection is skipped,
+    and older chunks of a replaced file of the same name are removed first."""
+    if not doc_path.exists():
+        logger.debug("Queued document no longer exists: %s", doc_path)
+        return 0
+    file_hash = file_hash or file_sha256(doc_path)
+    first = collection.get(ids=[f"{doc_path.stem}_p1_c0"], include=["metadatas"])
+    if first["ids"] and (first["metadatas"][0] or {}).get("file_hash") != file_hash:
+        logger.info("Document changed, re-ingesting: %s", doc_path.name)
+        collection.delete(where={"source": doc_path.name})
+    # Same content saved under another name/category – never embed it twice
+    if collection.get(where={"file_hash": file_hash}, limit=1)["ids"]:
+        logger.debug("Skipping already-ingested: %s", doc_path.name)
+        return 0
+    return ingest_document(doc_path, collection, model, file_hash)
+
+
+def run_ingestion_worker(stop: threading.Event | None = None,
+                         poll_seconds: float = INGEST_POLL_SECONDS, batch: int = 10) -> dict:
+    """Consume the crawler's "document ready" queue until `stop` is set, so
+    documents become searchable seconds after they are downloaded instead of
+    after the whole crawl. Returns the same summary as run_ingestion."""
+    from crawler import init_db, claim_ready_documents, finish_ready_document, reset_ingest_queue
+
+    stop = stop or threading.Event()
+    init_db()
+    logger.info("Ingestion worker started (%d documents waiting)", reset_ingest_queue())
+    collection = model = None
+    summary = {"total_files": 0, "total_chunks": 0, "pdf": 0, "excel": 0, "word": 0}
+
+    while not stop.is_set():
+        try:
+            rows = claim_ready_documents(batch)
+        except Exception as exc:
+            logger.error("Ingestion queue unavailable: %s", exc)
+            rows = []
+        if not rows:
+            stop.wait(poll_seconds)
+            continue
+        if collection is None:
+            collection = get_chroma_collection()
+            model      = get_embed_model()
+        for queue_id, path, file_hash in rows:
+            doc_path = Path(path)
+            try:
+                with _ingest_lock:
+                    chunks = ingest_ready_document(doc_path, collection, model, file_hash)
+            except Exception as exc:
+                logger.error("Streaming ingestion of %s failed: %s", doc_path.name, exc)
+                finish_ready_document(queue_id, str(exc))
+                continue
+            finish_ready_document(queue_id)
+            if chunks:
+                summary["total_files"]  += 1
+                summary["total_chunks"] += chunks
+                summary[_DOC_TYPES.get(doc_path.suffix.lower(), "pdf")] += 1
+
+    logger.info("Ingestion worker stopped: %s", summary)
+    return summary
+
+
 # ─── Retrieval ─────────────────────────────────────────────────────────────────
 def retrieve_relevant_chunks(
     query: str,
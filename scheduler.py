@@ -18,9 +18,21 @@ _ON_CLOUD = Path("/mount/src").exists()
 _DATA_ROOT = Path("/tmp/irdai_data") if _ON_CLOUD else Path("data")
 STATE_FILE = _DATA_ROOT / "scheduler_state.json"
 
-# Default: scrape every 12 hours (in seconds)
+# Default: full HTML crawl every 12 hours (in seconds)
 UPDATE_INTERVAL = int(os.getenv("IRDAI_UPDATE_INTERVAL", str(12 * 3600)))
 
+# In between, sitemap/feed-only refreshes (run_incremental_crawl); 0 disables them
+INCREMENTAL_INTERVAL = int(os.getenv("IRDAI_INCREMENTAL_INTERVAL", str(30 * 60)))
+
+# Ingest each document as soon as the crawler downloads it (ingestion worker thread)
+STREAM_INGEST = os.getenv("IRDAI_STREAM_INGEST", "1") == "1"
+
+# How often the scheduler loop checks whether an update is due
+CHECK_INTERVAL = min(300, INCREMENTAL_INTERVAL or 300)
+
+# Crawl engine: "sequential" (run_crawl) or "async" (run_crawl_async)
+CRAWL_ENGINE = os.getenv("IRDAI_CRAWL_ENGINE", "sequential").lower()
+
 # ─── State Management ─────────────────────────────────────────────────────────
 def _read_state() -> dict:
     """Read scheduler state from disk."""
@@ -43,6 +55,7 @@ def get_last_update() -> dict:
     state = _read_state()
     return {
         "last_crawl":     state.get("last_crawl"),
+        "last_incremental": state.get("last_incremental"),
         "last_ingestion": state.get("last_ingestion"),
         "last_summary":   state.get("last_summary", {}),
         "is_running":     state.get("is_running", False),
@@ -55,8 +68,10 @@ _lock = threading.Lock()
 _scheduler_started = False
 
 
-def _run_update():
-    """Execute crawl + ingestion. Called by the background thread."""
+def _run_update(mode: str = "full"):
+    """Execute crawl + ingestion. Called by the background thread.
+    mode="incremental" only reads sitemaps/feeds, and skips ingestion when
+    that found no new documents."""
     state = _read_state()
     state["is_running"] = True
     state["last_error"] = None
@@ -64,13 +79,21 @@ def _run_update():
 
     try:
         # --- Phase 1: Crawl ---
-        logger.info("Scheduled crawl starting…")
-        from crawler import run_crawl
-        crawl_summary = run_crawl()
-        state["last_crawl"] = datetime.now(timezone.utc).isoformat()
+        logger.info("Scheduled %s crawl starting…", mode)
+        from crawler import run_crawl, run_crawl_async, run_incremental_crawl
+        now = datetime.now(timezone.utc).isoformat()
+        if mode == "incremental":
+            crawl_summary = run_incremental_crawl()
+            state["last_incremental"] = now
+        else:
+            crawl_summary = run_crawl_async() if CRAWL_ENGINE == "async" else run_crawl()
+            state["last_crawl"] = state["last_incremental"] = now
         state["crawl_summary"] = crawl_summary
         _write_state(state)
-        logger.info("Scheduled crawl complete: %s", crawl_summary)
+        logger.info("Scheduled %s crawl complete: %s", mode, crawl_summary)
+
+        if mode == "incremental" and not any(crawl_summary[k] for k in ("pdf", "excel", "word")):
+            return
 
         # --- Phase 2: Ingest ---
         logger.info("Scheduled ingestion starting…")
@@ -93,18 +116,29 @@ def _run_update():
         _write_state(state)
 
 
-def _needs_update() -> bool:
-    """Check if enough time has passed since the last update."""
-    state = _read_state()
-    last = state.get("last_crawl")
-    if not last:
-        return True  # Never crawled → need initial update
+def _elapsed_since(timestamp: str | None) -> float | None:
+    """Seconds since an ISO timestamp from the state file (None if unusable)."""
+    if not timestamp:
+        return None
     try:
-        last_dt = datetime.fromisoformat(last)
-        elapsed = (datetime.now(timezone.utc) - last_dt).total_seconds()
-        return elapsed >= UPDATE_INTERVAL
+        return (datetime.now(timezone.utc) - datetime.fromisoformat(timestamp)).total_seconds()
     except Exception:
-        return True
+        return None
+
+
+def _needs_update() -> str | None:
+    """Which update is due: "full" when UPDATE_INTERVAL has passed since the
+    last full crawl, "incremental" when INCREMENTAL_INTERVAL has passed since
+    the last crawl of either kind, else None."""
+    state = _read_state()
+    since_full = _elapsed_since(state.get("last_crawl"))
+    if since_full is None or since_full >= UPDATE_INTERVAL:
+        return "full"  # Never crawled → need initial update
+    if INCREMENTAL_INTERVAL > 0:
+        since_any = _elapsed_since(state.get("last_incremental"))
+        if since_any is None or min(since_any, since_full) >= INCREMENTAL_INTERVAL:
+            return "incremental"
+    return None
 
 
 def _scheduler_loop():
@@ -117,14 +151,14 @@ def _scheduler_loop():
             if _needs_update():
                 with _lock:
                     # Double-check after acquiring lock
-                    if _needs_update():
-                        logger.info("Update interval reached — starting scheduled update")
-                        _run_update()
+                    if (mode := _needs_update()):
+                        logger.info("Update interval reached — starting scheduled %s update", mode)
+                        _run_update(mode)
         except Exception as exc:
             logger.error("Scheduler loop error: %s", exc)
 
-        # Sleep for 5 minutes before checking again
-        time.sleep(300)
+        # Sleep (5 minutes at most) before checking again
+        time.sleep(CHECK_INTERVAL)
 
 
 def start_scheduler():
@@ -138,18 +172,43 @@ def start_scheduler():
 
     thread = threading.Thread(target=_scheduler_loop, daemon=True, name="irdai-scheduler")
     thread.start()
+    if STREAM_INGEST:
+        from ingestion import run_ingestion_worker
+        threading.Thread(target=run_ingestion_worker, daemon=True, name="irdai-ingest-worker").start()
     logger.info(
-        "Background scheduler started (interval=%ds, cloud=%s)",
-        UPDATE_INTERVAL, _ON_CLOUD,
+        "Background scheduler started (interval=%ds, incremental=%ds, cloud=%s)",
+        UPDATE_INTERVAL, INCREMENTAL_INTERVAL, _ON_CLOUD,
     )
 
 
+def _run_update_locked():
+    """_run_update for a manual trigger that already holds _lock."""
+    try:
+        _run_update()
+    finally:
+        _lock.release()
+
+
 def trigger_manual_update():
-    """Trigger an immediate update (non-blocking). Returns True if started."""
-    state = _read_state()
-    if state.get("is_running"):
+    """Trigger an immediate update (non-blocking). Returns True if started,
+    False while a scheduled or manual update is running."""
+    # Same lock as the scheduler loop: crawls share module-level run state
+    # (frontier, visited pages, run stats) and must not overlap
+    if not _lock.acquire(blocking=False):
         return False  # Already running
 
-    thread = threading.Thread(target=_run_update, daemon=True, name="irdai-manual-update")
+    thread = threading.Thread(target=_run_update_locked, daemon=True, name="irdai-manual-update")
     thread.start()
     return True
+
+
+def run_manual_crawl() -> dict | None:
+    """Run a full crawl (no ingestion) in the calling thread, under the
+    scheduler's lock. Returns its summary, or None if an update is running."""
+    if not _lock.acquire(blocking=False):
+        return None
+    try:
+        from crawler import run_crawl, run_crawl_async
+        return run_crawl_async() if CRAWL_ENGINE == "async" else run_crawl()
+    finally:
+        _lock.release()
@@ -0,0 +1,213 @@
+"""
+IRDAI Compliance GPT - Web Archive
+Record crawler HTTP traffic into a WARC-style archive and replay it offline.
+
+    RecordingAdapter  wraps the crawler's transport and appends every
+                      request/response pair to a .warc file
+    ReplayAdapter     serves a .warc file instead of the network, with
+                      simulated latency (fixed, or the recorded timings)
+
+The crawler installs either adapter from IRDAI_RECORD_ARCHIVE /
+IRDAI_REPLAY_ARCHIVE (see crawler._shared_adapter).
+"""
+
+import io
+import time
+import threading
+from uuid import uuid4
+from pathlib import Path
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Headers that describe the wire encoding, not the (decoded) body we store
+_WIRE_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection"}
+
+
+# ─── WARC Records ──────────────────────────────────────────────────────────────
+class WarcWriter:
+    """Thread-safe appender of WARC/1.0 request and response records."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _record(warc_type: str, url: str, block: bytes, extra: dict) -> bytes:
+        headers = {
+            "WARC-Type":       warc_type,
+            "WARC-Record-ID":  f"<urn:uuid:{uuid4()}>",
+            "WARC-Date":       datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "WARC-Target-URI": url,
+            "Content-Type":    f"application/http; msgtype={warc_type}",
+            **extra,
+            "Content-Length":  str(len(block)),
+        }
+        head = "WARC/1.0\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+        return head.encode() + block + b"\r\n\r\n"
+
+    def write_exchange(self, request: requests.PreparedRequest,
+                       response: requests.Response, elapsed: float):
+        """Append one request and its response (body already decoded)."""
+        parts = urlsplit(request.url)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        req_block = (
+            f"{request.method} {target} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+            + "".join(f"{k}: {v}\r\n" for k, v in request.headers.items())
+            + "\r\n"
+        ).encode()
+
+        body = response.content or b""
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _WIRE_HEADERS]
+        headers.append(("Content-Length", str(len(body))))
+        resp_block = (
+            f"HTTP/1.1 {response.status_code} {response.reason or ''}\r\n"
+            + "".join(f"{k}: {v}\r\n" for k, v in headers)
+            + "\r\n"
+        ).encode() + body
+
+        req_id = f"<urn:uuid:{uuid4()}>"
+        data = self._record("request", request.url, req_block, {"WARC-Record-ID": req_id})
+        data += self._record("response", request.url, resp_block, {
+            "WARC-Concurrent-To": req_id,
+            "WARC-Elapsed":       f"{elapsed:.4f}",
+        })
+        with self._lock, open(self.path, "ab") as fh:
+            fh.write(data)
+
+
+def iter_warc(path: Path):
+    """Yield (warc_headers, block) for every record of an uncompressed WARC file."""
+    with open(path, "rb") as fh:
+        while True:
+            line = fh.readline()
+            if not line:
+                return
+            if not line.strip():
+                continue
+            headers = {}
+            while (line := fh.readline().rstrip(b"\r\n")):
+                key, _, value = line.decode("utf-8", "replace").partition(":")
+                headers[key.strip()] = value.strip()
+            block = fh.read(int(headers.get("Content-Length", 0)))
+            yield headers, block
+
+
+class ArchivedResponse:
+    __slots__ = ("status", "reason", "headers", "body", "elapsed")
+
+    def __init__(self, status: int, reason: str, headers: list[tuple[str, str]],
+                 body: bytes, elapsed: float):
+        self.status, self.reason, self.headers = status, reason, headers
+        self.body, self.elapsed = body, elapsed
+
+
+def load_archive(path: Path) -> dict[str, ArchivedResponse]:
+    """URL → archived response. The last full response recorded for a URL
+    wins over 304s, so conditional requests can be answered from it."""
+    archive: dict[str, ArchivedResponse] = {}
+    for headers, block in iter_warc(path):
+        if headers.get("WARC-Type") != "response":
+            continue
+        head, _, body = block.partition(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("iso-8859-1").split("\r\n")
+        _, status, *reason = status_line.split(" ", 2)
+        resp = ArchivedResponse(
+            int(status), reason[0] if reason else "",
+            [tuple(h.split(": ", 1)) for h in header_lines if ": " in h],
+            body, float(headers.get("WARC-Elapsed", 0)),
+        )
+        url = headers["WARC-Target-URI"]
+        if resp.status != 304 or url not in archive:
+            archive[url] = resp
+    return archive
+
+
+# ─── Transport Adapters ────────────────────────────────────────────────────────
+class RecordingAdapter(BaseAdapter):
+    """Delegates to another adapter and archives every exchange. Bodies are
+    read in full here, so streamed responses are served from memory."""
+
+    def __init__(self, inner: BaseAdapter, writer: WarcWriter):
+        super().__init__()
+        self.inner = inner
+        self.writer = writer
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = self.inner.send(request, **kwargs)
+        response.content  # noqa: B018 – force the body so it can be archived
+        self.writer.write_exchange(request, response, time.perf_counter() - start)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves an archive instead of the network.
+
+    `latency` seconds are slept per request; None replays each response's
+    recorded time. Conditional (If-None-Match / If-Modified-Since) and Range
+    requests are answered from the archived full response; URLs that were
+    never recorded get a 404.
+    """
+
+    def __init__(self, path: Path, latency: float | None = 0.0):
+        super().__init__()
+        self.archive = load_archive(path)
+        self.latency = latency
+
+    def _conditional_hit(self, request, headers: CaseInsensitiveDict) -> bool:
+        etag = headers.get("ETag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            return True
+        since, modified = request.headers.get("If-Modified-Since"), headers.get("Last-Modified")
+        if since and modified and not request.headers.get("If-None-Match"):
+            try:
+                return parsedate_to_datetime(modified) <= parsedate_to_datetime(since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        archived = self.archive.get(request.url)
+        delay = self.latency if self.latency is not None else (archived.elapsed if archived else 0)
+        if delay:
+            time.sleep(delay)
+
+        if archived is None:
+            status, reason, headers, body = 404, "Not Found", CaseInsensitiveDict(), b""
+        else:
+            status, reason, body = archived.status, archived.reason, archived.body
+            headers = CaseInsensitiveDict(archived.headers)
+            if status == 200 and self._conditional_hit(request, headers):
+                status, reason, body = 304, "Not Modified", b""
+            elif status == 200 and (rng := request.headers.get("Range", "")).startswith("bytes="):
+                start = int(rng[6:].split("-")[0] or 0)
+                if start < len(body):
+                    headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+                    status, reason, body = 206, "Partial Content", body[start:]
+        headers["Content-Length"] = str(len(body))
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = headers
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.encoding = get_encoding_from_headers(headers)
+        response.connection = self
+        return response
+
+    def close(self):
+        pass